@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, date
 from flask import (
     Flask,
     Response,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -10,8 +11,76 @@ from flask import (
     url_for,
 )
 import calendar
+from functools import lru_cache
+import gzip
+import hashlib
+from math import floor, inf, isfinite, log10
+import os
+import re
+from types import MappingProxyType
+
+try:
+    from numba import njit
+except ImportError:  # numba 是可选依赖，没装时公式按纯 Python 运行
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+try:
+    import orjson
+except ImportError:  # 没装 orjson 时使用 Flask 自带的 json
+    orjson = None
 
 app = Flask(__name__)
+# 生产环境模板不会变，关掉每次渲染的 mtime 检查；静态文件缓存一天
+app.config.update(TEMPLATES_AUTO_RELOAD=False, SEND_FILE_MAX_AGE_DEFAULT=86400)
+app.jinja_env.auto_reload = False
+
+
+# 静态文件按内容哈希加 ?v=，浏览器可以放心缓存一天，部署后 URL 变了就会重新拉取
+def _static_versions() -> dict:
+    # 键与 url_for 的 filename 一致：相对 static/ 的路径，统一用 "/"
+    versions = {}
+    for root, _, files in os.walk(app.static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, app.static_folder).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                versions[rel] = hashlib.md5(f.read()).hexdigest()[:10]
+    return versions
+
+
+STATIC_VERSIONS = _static_versions()
+
+
+@app.url_defaults
+def static_version(endpoint, values):
+    if endpoint == "static" and "v" not in values:
+        version = STATIC_VERSIONS.get(values.get("filename"))
+        if version:
+            values["v"] = version
+
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class ORJSONProvider(JSONProvider):
+        def dumps(self, obj, **kwargs) -> str:
+            return orjson.dumps(obj).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs) -> Response:
+            # orjson 直接输出 UTF-8 bytes，跳过 dumps() 的 decode 和 Response 里的再 encode
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE),
+                mimetype="application/json",
+            )
+
+    app.json = ORJSONProvider(app)
 
 # -----------------------
 # Brand / SEO / Domain
@@ -26,6 +95,13 @@ OLD_HOSTS = {
 }
 
 
+# 健康检查最先处理：不走旧域名跳转和页面逻辑
+@app.before_request
+def fast_healthz():
+    if request.path == "/healthz":
+        return Response(b"OK", mimetype="text/plain")
+
+
 @app.before_request
 def redirect_old_domain():
     host = request.host.split(":")[0].lower()
@@ -730,7 +806,17 @@ TOOLS = [
     },
 ]
 
-from flask import request
+SITEMAP_PATHS = (
+    ["/", "/tools", "/about", "/privacy", "/contact"]
+    + [f"/category/{slug}" for slug in CATEGORY_META.keys()]
+    + [t["path"] for t in TOOLS]
+)
+
+# 所有固定路径的 canonical URL 只拼一次
+_CANON = {
+    path: canonical_url(path)
+    for path in SITEMAP_PATHS + ["/maintenance-calories", "/sitemap.xml"]
+}
 
 def grouped_tools(current_path=None):
     """
@@ -843,7 +929,7 @@ def grouped_tools(current_path=None):
 def inject_global_nav():
     return {
         "nav_categories": grouped_tools(),
-        "top_tools": top_tools(10),
+        "top_tools": _TOP_TOOLS,
         "site_name": SITE_NAME,
         "site_name_zh": SITE_NAME_ZH,
     }
@@ -852,109 +938,288 @@ def meta_for(title: str, description: str, path: str) -> dict:
     return {
         "title": title,
         "description": description,
-        "canonical": canonical_url(path),
+        "canonical": _CANON.get(path) or canonical_url(path),
     }
 
 
 # -----------------------
 # Helpers
 # -----------------------
+def _clean(form, k: str, default: str = "") -> str:
+    # 浏览器提交的值大多没有首尾空白，只有确实需要时才 strip
+    s = form.get(k, default)
+    if s and (s[:1].isspace() or s[-1:].isspace()):
+        return s.strip()
+    return s
+
+
+# 先用正则判断格式，非法输入不再走 try/except
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)\s*")
+_INT_RE = re.compile(r"\s*[+-]?\d+\s*")
+
+
 def to_float(s: str) -> float | None:
-    try:
-        return float(str(s).strip())
-    except Exception:
+    if s is None or not _FLOAT_RE.fullmatch(s):
         return None
+    x = float(s)
+    # 位数极多时 float() 会溢出成 inf
+    return x if isfinite(x) else None
 
 
-def to_int(s: str) -> int | None:
+def parse_float(s: str) -> float:
+    """float(s) for form fields; nan / inf and non-numbers raise a message for the user."""
     try:
-        return int(str(s).strip())
-    except Exception:
+        x = float(s)
+    except (TypeError, ValueError):
+        x = inf
+    if not isfinite(x):
+        raise ValueError("请输入有效数字。")
+    return x
+
+
+def parse_int(s: str) -> int:
+    """int(s) for form fields; bad input raises a message for the user."""
+    try:
+        return int(s)
+    except (TypeError, ValueError):
+        raise ValueError("请输入整数。") from None
+
+
+def to_int(s: str) -> int | None:
+    if s is None:
+        return None
+    # 最常见的情况是纯数字，不用正则
+    if s.isdecimal() or _INT_RE.fullmatch(s):
+        return int(s)
+    return None
+
+
+def _in_range(x: float | None, lo: float, hi: float) -> bool:
+    # 表单校验：解析成功且 lo < x <= hi
+    return x is not None and lo < x <= hi
+
+
+# 身高、体重这类正数字段：可带 "+"，最多 4 位整数，小数位数不限（"170." / ".5" 也算），
+# 和原来 float() 接受的普通写法一致；格式不对直接返回 None
+_NUM_RE = re.compile(r"\s*\+?(?:\d{1,4}(?:\.\d*)?|\.\d+)\s*")
+# 最小正数。再小的身高会让 hm * hm 下溢成 0
+_NUM_MIN = 0.001
+
+
+def _parse_positive_float(s: str, lo: float, hi: float) -> float | None:
+    if s is None or not _NUM_RE.fullmatch(s):
         return None
+    x = float(s)
+    return x if lo < x <= hi and x >= _NUM_MIN else None
 
 
 def clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
 
+# 只用于展示，普通四舍五入即可，不需要 round() 的银行家舍入
 def round1(x: float) -> float:
-    return round(x, 1)
+    try:
+        return int(x * 10 + (0.5 if x >= 0 else -0.5)) / 10.0
+    except (OverflowError, ValueError):
+        # nan / inf 原样返回（和 round() 一样），校验交给各入口
+        return x
 
 
 def round0(x: float) -> int:
-    return int(round(x))
+    try:
+        return floor(x + 0.5)
+    except (OverflowError, ValueError):
+        return x
 
 
-def mifflin_st_jeor(sex: str, age: int, height_cm: float, weight_kg: float) -> float:
-    base = 10 * weight_kg + 6.25 * height_cm - 5 * age
-    return base + (5 if sex == "male" else -161)
+# -----------------------
+# HH:MM time helpers
+# -----------------------
+# 和原来 int() 拆分的写法一样，分钟允许一位（"7:5" 即 07:05），冒号两侧允许空格
+_HM_RE = re.compile(r"\s*([01]?\d|2[0-3])\s*:\s*([0-5]?\d)\s*")
 
 
-def bmi_category_cn(bmi: float) -> str:
-    if bmi < 18.5:
-        return "偏瘦"
-    if bmi < 24.0:
-        return "正常"
-    if bmi < 28.0:
-        return "偏胖"
-    return "肥胖"
+def parse_hm(s: str) -> tuple[int, int] | None:
+    m = _HM_RE.fullmatch(s)
+    if m is None:
+        return None
+    return int(m.group(1)), int(m.group(2))
 
 
-def bmi_progress(bmi: float) -> int:
-    p = (bmi - 15.0) / (35.0 - 15.0) * 100.0
-    return int(round(clamp(p, 0, 100)))
+def require_hm(s: str, example: str = "23:30") -> tuple[int, int]:
+    # 与 parse_hm 相同，但格式不对时直接抛出给用户看的错误
+    hm = parse_hm(s)
+    if hm is None:
+        if ":" not in s:
+            raise ValueError(f"请输入正确时间格式，例如 {example}。")
+        raise ValueError("请输入正确时间。")
+    return hm
 
 
-def bodyfat_us_navy(
-    sex: str,
+def add_minutes(h: int, m: int, minutes: int) -> tuple[int, int]:
+    total = h * 60 + m + minutes
+    total %= 24 * 60
+    return total // 60, total % 60
+
+
+# 一天只有 1440 个分钟，"HH:MM" 字符串提前全部生成好，按 h * 60 + m 取
+_HM_LABELS = tuple(f"{i // 60:02d}:{i % 60:02d}" for i in range(24 * 60))
+
+
+def fmt_hm(h: int, m: int) -> str:
+    return _HM_LABELS[h * 60 + m]
+
+
+# 纯数值公式放在 njit 内核里（字符串参数先在外层转成 bool）
+# 写明签名后 numba 在 import 时就编译（cache=True 时之后直接读磁盘缓存），不再需要预热调用
+@njit("float64(boolean, float64, float64, float64)", cache=True, fastmath=True)
+def _mifflin_kernel(is_male: bool, age: float, height_cm: float, weight_kg: float) -> float:
+    base = 10.0 * weight_kg + 6.25 * height_cm - 5.0 * age
+    return base + (5.0 if is_male else -161.0)
+
+
+@njit("float64(boolean, float64, float64, float64, float64)", cache=True, fastmath=True)
+def _bodyfat_kernel(
+    is_male: bool,
     height_cm: float,
     neck_cm: float,
     waist_cm: float,
-    hip_cm: float | None,
+    hip_cm: float,
 ) -> float:
-    import math
-
     h = height_cm
     n = neck_cm
     w = waist_cm
-    if sex == "male":
+    if is_male:
         return 495 / (
-            1.0324 - 0.19077 * math.log10(w - n) + 0.15456 * math.log10(h)
+            1.0324 - 0.19077 * log10(w - n) + 0.15456 * log10(h)
         ) - 450
+    return 495 / (
+        1.29579
+        - 0.35004 * log10(w + hip_cm - n)
+        + 0.22100 * log10(h)
+    ) - 450
+
+
+@njit("UniTuple(int64, 2)(boolean, float64, float64, float64, float64)", cache=True, fastmath=True)
+def _mifflin(is_male: bool, age: float, height_cm: float, weight_kg: float, factor: float):
+    """(round0(BMR), round0(BMR * factor)) in one call."""
+    bmr = _mifflin_kernel(is_male, age, height_cm, weight_kg)
+    return floor(bmr + 0.5), floor(bmr * factor + 0.5)
+
+
+def mifflin_st_jeor(sex: str, age: int, height_cm: float, weight_kg: float) -> float:
+    return _mifflin_kernel(sex == "male", float(age), float(height_cm), float(weight_kg))
+
+
+# BMI 分档：_bmi_kernel 返回的下标对应 _BMI_CATEGORIES
+_BMI_THRESHOLDS = (18.5, 24.0, 28.0)
+_BMI_CATEGORIES = ("偏瘦", "正常", "偏胖", "肥胖")
+# 内核直接比较这三个全局常量（numba 编译时当作常量折叠），阈值只在上面写一次
+_BMI_UNDER, _BMI_OVER, _BMI_OBESE = _BMI_THRESHOLDS
+
+
+@njit("int64(float64)", cache=True, fastmath=True)
+def bmi_progress(bmi: float) -> int:
+    # BMI 15–35 映射到 0–100：(bmi - 15) / 20 * 100，再 +0.5 四舍五入
+    i = int((bmi - 15.0) * 5.0 + 0.5)
+    return 0 if i < 0 else 100 if i > 100 else i
+
+
+@njit("Tuple((float64, int64, float64, float64, int64))(float64, float64)", cache=True, fastmath=True)
+def _bmi_kernel(height_cm: float, weight_kg: float):
+    """
+    Return (bmi, category_idx, ideal_min_kg, ideal_max_kg, progress).
+    ideal range is BMI 18.5–23.9 at this height.
+    """
+    hm = height_cm / 100.0
+    hm2 = hm * hm
+    bmi = weight_kg / hm2
+    if bmi < _BMI_UNDER:
+        idx = 0
+    elif bmi < _BMI_OVER:
+        idx = 1
+    elif bmi < _BMI_OBESE:
+        idx = 2
     else:
-        if hip_cm is None:
-            raise ValueError("female requires hip")
-        hip = hip_cm
-        return 495 / (
-            1.29579
-            - 0.35004 * math.log10(w + hip - n)
-            + 0.22100 * math.log10(h)
-        ) - 450
+        idx = 3
+    return bmi, idx, _BMI_UNDER * hm2, 23.9 * hm2, bmi_progress(bmi)
+
+
+# 同样的身高体重会被反复提交：最多 3 位小数的输入换成整数作缓存键，
+# 此时 key / 1000.0 还原出的 float 与 float(s) 完全相同；更多位小数的直接计算，不进缓存
+_NUM_SCALE = 1000
+
+
+def _num_key(x: float) -> int | None:
+    key = floor(x * _NUM_SCALE + 0.5)
+    return key if key / _NUM_SCALE == x else None
+
+
+@lru_cache(maxsize=4096)
+def _bmi_cached(height_key: int, weight_key: int):
+    return _bmi_kernel(height_key / _NUM_SCALE, weight_key / _NUM_SCALE)
+
+
+def bmi_calc(height_cm: float, weight_kg: float):
+    """Memoized _bmi_kernel for values parsed by _parse_positive_float."""
+    height_key = _num_key(height_cm)
+    weight_key = _num_key(weight_kg)
+    if height_key is None or weight_key is None:
+        return _bmi_kernel(height_cm, weight_kg)
+    return _bmi_cached(height_key, weight_key)
+
+
+@lru_cache(maxsize=4096)
+def _mifflin_cached(is_male: bool, age: int, height_key: int, weight_key: int, factor: float):
+    return _mifflin(
+        is_male, float(age), height_key / _NUM_SCALE, weight_key / _NUM_SCALE, factor
+    )
+
+
+def mifflin_calc(is_male: bool, age: int, height_cm: float, weight_kg: float, factor: float):
+    """Memoized _mifflin for values parsed by _parse_positive_float."""
+    height_key = _num_key(height_cm)
+    weight_key = _num_key(weight_kg)
+    if height_key is None or weight_key is None:
+        return _mifflin(is_male, float(age), height_cm, weight_kg, factor)
+    return _mifflin_cached(is_male, age, height_key, weight_key, factor)
+
+
+def bodyfat_us_navy(
+    sex: str,
+    height_cm: float,
+    neck_cm: float,
+    waist_cm: float,
+    hip_cm: float | None,
+) -> float:
+    if sex == "male":
+        return _bodyfat_kernel(True, float(height_cm), float(neck_cm), float(waist_cm), 0.0)
+    if hip_cm is None:
+        raise ValueError("female requires hip")
+    return _bodyfat_kernel(
+        False, float(height_cm), float(neck_cm), float(waist_cm), float(hip_cm)
+    )
+
+
+# 各公式的 (截距, 每英寸系数)，按性别预先分好
+IDEAL_WEIGHT_NAMES = ("Devine", "Robinson", "Miller", "Hamwi")
+IDEAL_WEIGHT_COEFFS = {
+    "male": ((50.0, 2.3), (52.0, 1.9), (56.2, 1.41), (48.0, 2.7)),
+    "female": ((45.5, 2.3), (49.0, 1.7), (53.1, 1.36), (45.5, 2.2)),
+}
 
 
 def ideal_weight_methods(height_cm: float, sex: str) -> dict:
     h_in = height_cm / 2.54
     over_5ft = max(0.0, h_in - 60.0)
 
-    if sex == "male":
-        devine = 50.0 + 2.3 * over_5ft
-        robinson = 52.0 + 1.9 * over_5ft
-        miller = 56.2 + 1.41 * over_5ft
-        hamwi = 48.0 + 2.7 * over_5ft
-    else:
-        devine = 45.5 + 2.3 * over_5ft
-        robinson = 49.0 + 1.7 * over_5ft
-        miller = 53.1 + 1.36 * over_5ft
-        hamwi = 45.5 + 2.2 * over_5ft
+    coeffs = IDEAL_WEIGHT_COEFFS["male" if sex == "male" else "female"]
+    values = [a + b * over_5ft for a, b in coeffs]
 
-    avg = (devine + robinson + miller + hamwi) / 4.0
-    return {
-        "Devine": devine,
-        "Robinson": robinson,
-        "Miller": miller,
-        "Hamwi": hamwi,
-        "Average": avg,
-    }
+    result = dict(zip(IDEAL_WEIGHT_NAMES, values))
+    result["Average"] = sum(values) / 4.0
+    return result
 
 # 1.2.2. 腰围风险
 def waist_risk(wc_cm: float, height_cm: float) -> tuple[float, str]:
@@ -1232,9 +1497,9 @@ def macro_split(tdee: float, goal: str) -> dict:
         "protein_g": protein_g,
         "carbs_g": carbs_g,
         "fat_g": fat_g,
-        "protein_ratio": int(round(p_ratio * 100)),
-        "carbs_ratio": int(round(c_ratio * 100)),
-        "fat_ratio": int(round(f_ratio * 100)),
+        "protein_ratio": round0(p_ratio * 100),
+        "carbs_ratio": round0(c_ratio * 100),
+        "fat_ratio": round0(f_ratio * 100),
     }
 # 3.3.1. 餐次分配
 def meal_split_plan(total_kcal: float, protein_g: float, pattern: str) -> dict:
@@ -1288,9 +1553,9 @@ def meal_split_plan(total_kcal: float, protein_g: float, pattern: str) -> dict:
         "breakfast_p": breakfast_p,
         "lunch_p": lunch_p,
         "dinner_p": dinner_p,
-        "breakfast_ratio": int(round(ratios[0] * 100)),
-        "lunch_ratio": int(round(ratios[1] * 100)),
-        "dinner_ratio": int(round(ratios[2] * 100)),
+        "breakfast_ratio": round0(ratios[0] * 100),
+        "lunch_ratio": round0(ratios[1] * 100),
+        "dinner_ratio": round0(ratios[2] * 100),
     }
 # 3.4.1. GL估算 
 def glycemic_load_info(gi: float, carbs_g: float, fiber_g: float = 0.0) -> dict:
@@ -1637,7 +1902,7 @@ def caffeine_intake_estimate(
         progress = 90
 
     return {
-        "total_mg": int(round(total_mg)),
+        "total_mg": round0(total_mg),
         "level": level,
         "note": note,
         "progress": progress,
@@ -1705,7 +1970,7 @@ def steps_to_time(steps: int, pace: str) -> dict:
 
     total_minutes = steps / spm
     hours = int(total_minutes // 60)
-    minutes = int(round(total_minutes % 60))
+    minutes = round0(total_minutes % 60)
 
     if minutes == 60:
         hours += 1
@@ -1731,7 +1996,7 @@ def deficit_plan(tdee: float, mode: str) -> tuple[int, str]:
     else:
         delta = 0
         label = "维持体重"
-    target = max(1200, int(round(tdee + delta)))
+    target = max(1200, round0(tdee + delta))
     return target, label
 
 # 4.1.4 每日步数目标
@@ -1907,6 +2172,23 @@ def running_kcal_estimate(weight_kg: float, minutes: float, pace: str) -> dict:
         "progress": progress,
     }
 # 4.1.7 跑步配速
+def fmt_hms(sec: float) -> str:
+    sec = round0(sec)
+    h = sec // 3600
+    m = (sec % 3600) // 60
+    s = sec % 60
+    if h > 0:
+        return f"{h:d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+
+def fmt_pace(sec_per_km: float) -> str:
+    sec_per_km = round0(sec_per_km)
+    m = sec_per_km // 60
+    s = sec_per_km % 60
+    return f"{m:d}'{s:02d}\" /km"
+
+
 def running_pace_info(distance_km: float, hours: int, minutes: int, seconds: int) -> dict:
     """
     Running pace calculator.
@@ -1937,21 +2219,6 @@ def running_pace_info(distance_km: float, hours: int, minutes: int, seconds: int
     pace_sec_per_km = total_seconds / distance_km
     speed_kmh = distance_km / (total_seconds / 3600.0)
 
-    def fmt_hms(sec: float) -> str:
-        sec = int(round(sec))
-        h = sec // 3600
-        m = (sec % 3600) // 60
-        s = sec % 60
-        if h > 0:
-            return f"{h:d}:{m:02d}:{s:02d}"
-        return f"{m:02d}:{s:02d}"
-
-    def fmt_pace(sec_per_km: float) -> str:
-        sec_per_km = int(round(sec_per_km))
-        m = sec_per_km // 60
-        s = sec_per_km % 60
-        return f"{m:d}'{s:02d}\" /km"
-
     # common target distances
     projections = {
         "3k": fmt_hms(pace_sec_per_km * 3),
@@ -2153,11 +2420,12 @@ def conception_info(lmp_date: date) -> dict:
     }
 
 # 5.1.1
-from datetime import datetime, timedelta, date
-import calendar
 
 def parse_date(date_str):
-    return datetime.strptime(date_str, "%Y-%m-%d").date()
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("请输入正确日期（例如 2026-01-31）。") from None
 
 def format_week_label(days_from_lmp):
     weeks = days_from_lmp // 7
@@ -2278,6 +2546,19 @@ def period_cycle_info(lmp_date: date, cycle_length: int, period_length: int) ->
         "period_length": period_length,
     }
 # 5.1.6 安全期计算
+def fmt_date(d: date) -> str:
+    return d.strftime("%Y-%m-%d")
+
+
+def date_range_or_none(start_d: date, end_d: date) -> dict | None:
+    if start_d > end_d:
+        return None
+    return {
+        "start": fmt_date(start_d),
+        "end": fmt_date(end_d),
+    }
+
+
 def safe_days_info(lmp_date: date, cycle_length: int, period_length: int) -> dict:
     """
     Safe days calculator (educational estimate only).
@@ -2319,9 +2600,6 @@ def safe_days_info(lmp_date: date, cycle_length: int, period_length: int) -> dic
 
     current_cycle_day = (today - cycle_start).days + 1
 
-    def fmt(d: date) -> str:
-        return d.strftime("%Y-%m-%d")
-
     # current status
     if fertile_start <= today <= fertile_end:
         current_status = "当前接近易孕期"
@@ -2336,27 +2614,19 @@ def safe_days_info(lmp_date: date, cycle_length: int, period_length: int) -> dic
         current_status = "当前在周期后段"
         progress = 60
 
-    def valid_range(start_d: date, end_d: date):
-        if start_d > end_d:
-            return None
-        return {
-            "start": fmt(start_d),
-            "end": fmt(end_d),
-        }
-
     return {
-        "today": fmt(today),
-        "cycle_start": fmt(cycle_start),
-        "cycle_end": fmt(cycle_end),
+        "today": fmt_date(today),
+        "cycle_start": fmt_date(cycle_start),
+        "cycle_end": fmt_date(cycle_end),
         "current_cycle_day": current_cycle_day,
         "current_status": current_status,
         "progress": progress,
-        "period_end": fmt(period_end),
-        "estimated_ovulation": fmt(estimated_ovulation),
-        "fertile_start": fmt(fertile_start),
-        "fertile_end": fmt(fertile_end),
-        "safe_early": valid_range(safe_early_start, safe_early_end),
-        "safe_late": valid_range(safe_late_start, safe_late_end),
+        "period_end": fmt_date(period_end),
+        "estimated_ovulation": fmt_date(estimated_ovulation),
+        "fertile_start": fmt_date(fertile_start),
+        "fertile_end": fmt_date(fertile_end),
+        "safe_early": date_range_or_none(safe_early_start, safe_early_end),
+        "safe_late": date_range_or_none(safe_late_start, safe_late_end),
         "cycle_length": cycle_length,
         "period_length": period_length,
     }
@@ -2489,6 +2759,9 @@ def implantation_info(lmp_date: date | None = None, ovulation_date: date | None
 # 5.2.1 孕期体重增长
 def pregnancy_weight_gain(height_cm: float, weight_kg: float) -> dict:
 
+    if not 0 < height_cm <= 250 or not 0 < weight_kg <= 300:
+        raise ValueError("请输入有效身高和体重")
+
     height_m = height_cm / 100
     bmi = weight_kg / (height_m ** 2)
 
@@ -2685,35 +2958,40 @@ def pregnancy_water_need(weight_kg: float, trimester: str) -> dict:
 # -----------------------
 # SEO: robots + sitemap
 # -----------------------
-@app.get("/robots.txt")
-def robots():
-    lines = [
+# Both bodies only depend on module constants, so build them once at import.
+_ROBOTS_BODY = (
+    "\n".join([
         "User-agent: *",
         "Allow: /",
-        f"Sitemap: {canonical_url('/sitemap.xml')}",
-    ]
-    return Response("\n".join(lines) + "\n", mimetype="text/plain")
-
-
-@app.get("/sitemap.xml")
-def sitemap():
-    core_paths = ["/", "/tools", "/about", "/privacy", "/contact"]
-    category_paths = [f"/category/{slug}" for slug in CATEGORY_META.keys()]
-    tool_paths = [t["path"] for t in TOOLS]
-    all_paths = core_paths + category_paths + tool_paths
+        f"Sitemap: {_CANON['/sitemap.xml']}",
+    ])
+    + "\n"
+).encode("utf-8")
 
-    xml = [
+_SITEMAP_BODY = "\n".join(
+    [
         '<?xml version="1.0" encoding="UTF-8"?>',
         '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
     ]
+    + [f"  <url>\n    <loc>{_CANON[path]}</loc>\n  </url>" for path in SITEMAP_PATHS]
+    + ["</urlset>"]
+).encode("utf-8")
+
+SEO_CACHE_CONTROL = "public, max-age=86400"
+
+
+@app.get("/robots.txt")
+def robots():
+    resp = Response(_ROBOTS_BODY, mimetype="text/plain")
+    resp.headers["Cache-Control"] = SEO_CACHE_CONTROL
+    return resp
 
-    for path in all_paths:
-        xml.append("  <url>")
-        xml.append(f"    <loc>{canonical_url(path)}</loc>")
-        xml.append("  </url>")
 
-    xml.append("</urlset>")
-    return Response("\n".join(xml), mimetype="application/xml")
+@app.get("/sitemap.xml")
+def sitemap():
+    resp = Response(_SITEMAP_BODY, mimetype="application/xml")
+    resp.headers["Cache-Control"] = SEO_CACHE_CONTROL
+    return resp
 
 
 
@@ -2762,7 +3040,7 @@ def sleep_recovery_info(debt_hours: float, recovery_ratio: float) -> dict:
     """
     if debt_hours < 0 or debt_hours > 200:
         raise ValueError("请输入合理的睡眠债时长。")
-    if recovery_ratio <= 0 or recovery_ratio > 8:
+    if recovery_ratio < 0.1 or recovery_ratio > 8:
         raise ValueError("请输入合理的每日补觉时长。")
 
     if debt_hours == 0:
@@ -2795,19 +3073,8 @@ def sleep_duration_info(bed_hm: str, wake_hm: str, target_hours: float = 8.0) ->
 
     bed_hm / wake_hm format: HH:MM
     """
-    def parse_hm(s: str) -> tuple[int, int]:
-        s = s.strip()
-        if ":" not in s:
-            raise ValueError("请输入正确时间格式，例如 23:30。")
-        hh, mm = s.split(":", 1)
-        h = int(hh)
-        m = int(mm)
-        if h < 0 or h > 23 or m < 0 or m > 59:
-            raise ValueError("请输入正确时间。")
-        return h, m
-
-    bed_h, bed_m = parse_hm(bed_hm)
-    wake_h, wake_m = parse_hm(wake_hm)
+    bed_h, bed_m = require_hm(bed_hm, "23:30")
+    wake_h, wake_m = require_hm(wake_hm, "23:30")
 
     bed_total = bed_h * 60 + bed_m
     wake_total = wake_h * 60 + wake_m
@@ -2854,26 +3121,7 @@ def nap_time_info(mode: str, time_hm: str) -> dict:
     - wake_at: input desired wake time, output suggested nap start times
     """
 
-    def parse_hm(s: str) -> tuple[int, int]:
-        s = s.strip()
-        if ":" not in s:
-            raise ValueError("请输入正确时间格式，例如 13:20。")
-        hh, mm = s.split(":", 1)
-        h = int(hh)
-        m = int(mm)
-        if h < 0 or h > 23 or m < 0 or m > 59:
-            raise ValueError("请输入正确时间。")
-        return h, m
-
-    def add_minutes(h: int, m: int, minutes: int) -> tuple[int, int]:
-        total = h * 60 + m + minutes
-        total %= 24 * 60
-        return total // 60, total % 60
-
-    def fmt(h: int, m: int) -> str:
-        return f"{h:02d}:{m:02d}"
-
-    h, m = parse_hm(time_hm)
+    h, m = require_hm(time_hm, "13:20")
 
     short_nap = 20
     full_cycle = 90
@@ -2884,9 +3132,9 @@ def nap_time_info(mode: str, time_hm: str) -> dict:
         return {
             "mode_label": "现在开始午睡",
             "short_label": "短午睡（约 20 分钟）",
-            "short_time": fmt(short_h, short_m),
+            "short_time": fmt_hm(short_h, short_m),
             "full_label": "完整周期午睡（约 90 分钟）",
-            "full_time": fmt(full_h, full_m),
+            "full_time": fmt_hm(full_h, full_m),
         }
 
     if mode == "wake_at":
@@ -2895,9 +3143,9 @@ def nap_time_info(mode: str, time_hm: str) -> dict:
         return {
             "mode_label": "按目标起床时间倒推",
             "short_label": "短午睡建议开始时间",
-            "short_time": fmt(short_h, short_m),
+            "short_time": fmt_hm(short_h, short_m),
             "full_label": "完整周期午睡建议开始时间",
-            "full_time": fmt(full_h, full_m),
+            "full_time": fmt_hm(full_h, full_m),
         }
 
     raise ValueError("模式选择不正确。")
@@ -2969,19 +3217,8 @@ def sleep_efficiency_info(
     - awake_during_night_min: total minutes awake during the night
     """
 
-    def parse_hm(s: str) -> tuple[int, int]:
-        s = s.strip()
-        if ":" not in s:
-            raise ValueError("请输入正确时间格式，例如 23:00。")
-        hh, mm = s.split(":", 1)
-        h = int(hh)
-        m = int(mm)
-        if h < 0 or h > 23 or m < 0 or m > 59:
-            raise ValueError("请输入正确时间。")
-        return h, m
-
-    bed_h, bed_m = parse_hm(bed_hm)
-    wake_h, wake_m = parse_hm(wake_hm)
+    bed_h, bed_m = require_hm(bed_hm, "23:00")
+    wake_h, wake_m = require_hm(wake_hm, "23:00")
 
     if sleep_latency_min < 0 or sleep_latency_min > 600:
         raise ValueError("请输入合理的入睡耗时（分钟）。")
@@ -3028,35 +3265,16 @@ def caffeine_cutoff_info(sleep_hm: str, cutoff_hours: float = 6.0) -> dict:
     cutoff time = bedtime - cutoff_hours
     """
 
-    def parse_hm(s: str) -> tuple[int, int]:
-        s = s.strip()
-        if ":" not in s:
-            raise ValueError("请输入正确时间格式，例如 23:00。")
-        hh, mm = s.split(":", 1)
-        h = int(hh)
-        m = int(mm)
-        if h < 0 or h > 23 or m < 0 or m > 59:
-            raise ValueError("请输入正确时间。")
-        return h, m
-
-    def add_minutes(h: int, m: int, minutes: int) -> tuple[int, int]:
-        total = h * 60 + m + minutes
-        total %= 24 * 60
-        return total // 60, total % 60
-
-    def fmt(h: int, m: int) -> str:
-        return f"{h:02d}:{m:02d}"
-
     if cutoff_hours <= 0 or cutoff_hours > 12:
         raise ValueError("请输入合理的截止时长。")
 
-    h, m = parse_hm(sleep_hm)
-    cutoff_min = int(round(cutoff_hours * 60))
+    h, m = require_hm(sleep_hm, "23:00")
+    cutoff_min = round0(cutoff_hours * 60)
     ch, cm = add_minutes(h, m, -cutoff_min)
 
     return {
         "sleep_time": sleep_hm,
-        "cutoff_time": fmt(ch, cm),
+        "cutoff_time": fmt_hm(ch, cm),
         "cutoff_hours": round(cutoff_hours, 1),
     }
 
@@ -3139,36 +3357,38 @@ def chronotype_result(score: int) -> dict:
 # 3. Pages
 # -----------------------
 
+_META_INDEX = meta_for(
+    f"{SITE_NAME} - 健康计算工具导航",
+    "BMI、TDEE、BMR、体脂率、理想体重、蛋白质、睡眠、预产期等在线健康工具。",
+    "/",
+)
+
 @app.get("/")
 def index():
-    featured_tools = top_tools(10)
-    meta = meta_for(
-        f"{SITE_NAME} - 健康计算工具导航",
-        "BMI、TDEE、BMR、体脂率、理想体重、蛋白质、睡眠、预产期等在线健康工具。",
-        "/",
-    )
     return render_template(
         "index.html",
-        meta=meta,
+        meta=_META_INDEX,
         categories=grouped_tools(),
-        featured_tools=featured_tools,
+        featured_tools=_TOP_TOOLS,
         tools=TOOLS,
         page_kind="home",
     )
 
+
+_META_TOOLS = meta_for(
+    f"工具导航 - {SITE_NAME}",
+    "按分类浏览 CalmyHealth 的健康工具：体重与体型、代谢与热量、营养摄入、运动与习惯、孕期工具。",
+    "/tools",
+)
+
 @app.get("/tools")
 def tools():
-    meta = meta_for(
-        f"工具导航 - {SITE_NAME}",
-        "按分类浏览 CalmyHealth 的健康工具：体重与体型、代谢与热量、营养摄入、运动与习惯、孕期工具。",
-        "/tools",
-    )
     return render_template(
         "tools.html",
-        meta=meta,
+        meta=_META_TOOLS,
         categories=grouped_tools(),
         tools=TOOLS,
-        top_tools=top_tools(10),
+        top_tools=_TOP_TOOLS,
         page_kind="tools",
     )
 
@@ -3182,6 +3402,18 @@ def top_tools(limit=10):
     )
     return ranked[:limit]
 
+# TOOLS is fixed at import, so the featured list never changes between requests.
+_TOP_TOOLS = top_tools(10)
+
+_META_CATEGORY = {
+    slug: meta_for(
+        f"{cat.get('name', slug)}工具 - {SITE_NAME}",
+        f"浏览 {cat.get('name', slug)} 相关健康工具：{cat.get('description', '')}",
+        f"/category/{slug}",
+    )
+    for slug, cat in CATEGORY_META.items()
+}
+
 @app.get("/category/<slug>")
 def category_page(slug: str):
     nav_groups = grouped_tools()
@@ -3190,53 +3422,50 @@ def category_page(slug: str):
     if current_cat is None:
         return redirect(url_for("tools"))
 
-    meta = meta_for(
-        f"{current_cat['name']}工具 - {SITE_NAME}",
-        f"浏览 {current_cat['name']} 相关健康工具：{current_cat['description']}",
-        f"/category/{slug}",
-    )
-
     return render_template(
         "category.html",
-        meta=meta,
+        meta=_META_CATEGORY[slug],
         current_cat=current_cat,
         categories=nav_groups,
         page_kind="category",
     )
 
 
+_META_ABOUT = meta_for(
+    f"关于 - {SITE_NAME}",
+    "关于 CalmyHealth：围绕健康数据理解与工具化场景，持续扩展可读、可用、可导航的健康工具页面。",
+    "/about",
+)
+
 @app.get("/about")
 def about():
-    meta = meta_for(
-        f"关于 - {SITE_NAME}",
-        "关于 CalmyHealth：围绕健康数据理解与工具化场景，持续扩展可读、可用、可导航的健康工具页面。",
-        "/about",
-    )
-    return render_template("about.html", meta=meta)
+    return render_template("about.html", meta=_META_ABOUT)
 
 
+_META_PRIVACY = meta_for(
+    f"隐私政策 - {SITE_NAME}",
+    "隐私政策：CalmyHealth 不要求账号，不出售个人信息；输入数据仅用于当次计算展示（服务器日志除外）。",
+    "/privacy",
+)
+
 @app.get("/privacy")
 def privacy():
-    meta = meta_for(
-        f"隐私政策 - {SITE_NAME}",
-        "隐私政策：CalmyHealth 不要求账号，不出售个人信息；输入数据仅用于当次计算展示（服务器日志除外）。",
-        "/privacy",
-    )
-    return render_template("privacy.html", meta=meta)
+    return render_template("privacy.html", meta=_META_PRIVACY)
+
+
+_META_CONTACT = meta_for(
+    f"联系 - {SITE_NAME}",
+    "联系页面：反馈建议、Bug 报告与合作咨询。",
+    "/contact",
+)
 
 @app.get("/contact")
 def contact():
-    meta = meta_for(
-        f"联系 - {SITE_NAME}",
-        "联系页面：反馈建议、Bug 报告与合作咨询。",
-        "/contact",
-    )
-
     contact_email = "hello@calmyhealth.com"  # 这里换成你的邮箱
 
     return render_template(
         "contact.html",
-        meta=meta,
+        meta=_META_CONTACT,
         contact_email=contact_email
     )
 # -----------------------
@@ -3245,8 +3474,58 @@ def contact():
 # 1. 体重与体型
 # ========= 1.1. BMI与体重 ======= 
 ## 1.1.1 BMI (Route)
+_META_BMI = meta_for(
+    "BMI 计算器（高级版）- CalmyHealth",
+    "在线 BMI 计算器：支持身高体重输入，输出 BMI 数值、成人参考范围、健康体重区间与行动建议，并推荐 BMR/TDEE 等相关工具。",
+    "/bmi",
+)
+
+# 按 _bmi_kernel 返回的分类下标（偏瘦 / 正常 / 偏胖 / 肥胖）给出建议
+_BMI_ADVICE = (
+    (
+        "优先保证规律三餐与足够蛋白质摄入。",
+        "每周进行 2–3 次力量训练，提升肌肉量与体能。",
+        "关注睡眠质量与压力水平，避免长期熬夜。",
+    ),
+    (
+        "保持当前体重趋势，重点关注腰围与体脂率。",
+        "每周累计 150 分钟中等强度运动更容易长期维持。",
+        "饮食上优先选择高纤维、足够蛋白质与稳定作息。",
+    ),
+    (
+        "先算 TDEE，尝试每天减少约 300–500 kcal 的热量缺口。",
+        "增加步行与力量训练，帮助维持代谢与肌肉量。",
+        "记录 2–4 周趋势再调整，不必被单日波动影响。",
+    ),
+    (
+        "从温和热量缺口与规律运动开始，优先提升可坚持性。",
+        "建议结合腰围/体脂率与体检指标进行综合评估。",
+        "如有慢病或不适，优先咨询专业人士获取个性化建议。",
+    ),
+)
+
+_BMI_GET_CTX = {
+    "meta": _META_BMI,
+    "error": None,
+    "bmi": None,
+    "category": None,
+    "progress": None,
+    "ideal_min": None,
+    "ideal_max": None,
+    "to_min": None,
+    "to_max": None,
+    "suggestion_title": "行动建议（仅供参考）",
+    "suggestions": (),
+    "risk_note": "提示：本工具仅用于一般参考，不构成医疗建议。",
+    "height_cm_in": "",
+    "weight_kg_in": "",
+}
+
 @app.route("/bmi", methods=["GET", "POST"])
 def bmi():
+    if request.method != "POST":
+        return render_template("bmi.html", **_BMI_GET_CTX)
+
     error = None
     bmi_val = None
     category = None
@@ -3257,66 +3536,31 @@ def bmi():
     suggestions = []
     risk_note = "提示：本工具仅用于一般参考，不构成医疗建议。"
 
-    height_cm_in = ""
-    weight_kg_in = ""
+    height_cm_in = request.form.get("height_cm", "")
+    weight_kg_in = request.form.get("weight_kg", "")
+    h = _parse_positive_float(height_cm_in, 0, inf)
+    w = _parse_positive_float(weight_kg_in, 0, inf)
 
-    if request.method == "POST":
-        height_cm_in = request.form.get("height_cm", "")
-        weight_kg_in = request.form.get("weight_kg", "")
-        h = to_float(height_cm_in)
-        w = to_float(weight_kg_in)
+    if h is None or w is None:
+        error = "请输入正确的身高与体重。"
+    else:
+        bmi_raw, cat_idx, ideal_min_raw, ideal_max_raw, progress = bmi_calc(h, w)
+        bmi_val = round1(bmi_raw)
+        category = _BMI_CATEGORIES[cat_idx]
 
-        if not h or not w or h <= 0 or w <= 0:
-            error = "请输入正确的身高与体重。"
-        else:
-            hm = h / 100.0
-            bmi_raw = w / (hm * hm)
-            bmi_val = round1(bmi_raw)
-            category = bmi_category_cn(bmi_raw)
-            progress = bmi_progress(bmi_raw)
-
-            ideal_min = round1(18.5 * hm * hm)
-            ideal_max = round1(23.9 * hm * hm)
-
-            if bmi_raw < 18.5:
-                to_min = round1(ideal_min - w)
-            elif bmi_raw > 23.9:
-                to_max = round1(w - ideal_max)
-
-            if bmi_raw < 18.5:
-                suggestions = [
-                    "优先保证规律三餐与足够蛋白质摄入。",
-                    "每周进行 2–3 次力量训练，提升肌肉量与体能。",
-                    "关注睡眠质量与压力水平，避免长期熬夜。",
-                ]
-            elif bmi_raw < 24.0:
-                suggestions = [
-                    "保持当前体重趋势，重点关注腰围与体脂率。",
-                    "每周累计 150 分钟中等强度运动更容易长期维持。",
-                    "饮食上优先选择高纤维、足够蛋白质与稳定作息。",
-                ]
-            elif bmi_raw < 28.0:
-                suggestions = [
-                    "先算 TDEE，尝试每天减少约 300–500 kcal 的热量缺口。",
-                    "增加步行与力量训练，帮助维持代谢与肌肉量。",
-                    "记录 2–4 周趋势再调整，不必被单日波动影响。",
-                ]
-            else:
-                suggestions = [
-                    "从温和热量缺口与规律运动开始，优先提升可坚持性。",
-                    "建议结合腰围/体脂率与体检指标进行综合评估。",
-                    "如有慢病或不适，优先咨询专业人士获取个性化建议。",
-                ]
-
-    meta = meta_for(
-        "BMI 计算器（高级版）- CalmyHealth",
-        "在线 BMI 计算器：支持身高体重输入，输出 BMI 数值、成人参考范围、健康体重区间与行动建议，并推荐 BMR/TDEE 等相关工具。",
-        "/bmi",
-    )
+        ideal_min = round1(ideal_min_raw)
+        ideal_max = round1(ideal_max_raw)
+
+        if bmi_raw < 18.5:
+            to_min = round1(ideal_min - w)
+        elif bmi_raw > 23.9:
+            to_max = round1(w - ideal_max)
+
+        suggestions = _BMI_ADVICE[cat_idx]
 
     return render_template(
         "bmi.html",
-        meta=meta,
+        meta=_META_BMI,
         error=error,
         bmi=bmi_val,
         category=category,
@@ -3339,34 +3583,44 @@ def bmi():
 # 2. 代谢与热量
 # ========= 2.2. 热量规划 ======= 
 ## 2.2.1 热量缺口
+_META_DEFICIT = meta_for(
+    "热量缺口与目标热量 - CalmyHealth",
+    "根据 TDEE 估算减脂/维持/增肌的目标日摄入热量（kcal/天），并提供下一步建议（蛋白质、步数、体重趋势）。",
+    "/deficit",
+)
+
+_DEFICIT_GET_CTX = {
+    "meta": _META_DEFICIT,
+    "error": None,
+    "tdee_in": "",
+    "mode_in": "loss_easy",
+    "target_kcal": None,
+    "label": None,
+}
+
 @app.route("/deficit", methods=["GET", "POST"])
 def deficit():
+    if request.method != "POST":
+        return render_template("deficit.html", **_DEFICIT_GET_CTX)
+
     error = None
-    tdee_in = ""
-    mode_in = "loss_easy"
     target_kcal = None
     label = None
 
-    if request.method == "POST":
-        tdee_in = request.form.get("tdee", "")
-        mode_in = request.form.get("mode", "loss_easy")
-        tdee_val = to_float(tdee_in)
-
-        if not tdee_val or tdee_val <= 0 or tdee_val > 10000:
-            error = "请输入正确的 TDEE（kcal/天）。"
-        elif mode_in not in ("loss_easy", "loss_fast", "maintain", "gain"):
-            error = "模式选择不正确。"
-        else:
-            target_kcal, label = deficit_plan(tdee_val, mode_in)
+    tdee_in = request.form.get("tdee", "")
+    mode_in = request.form.get("mode", "loss_easy")
+    tdee_val = to_float(tdee_in)
+
+    if not _in_range(tdee_val, 0, 10000):
+        error = "请输入正确的 TDEE（kcal/天）。"
+    elif mode_in not in ("loss_easy", "loss_fast", "maintain", "gain"):
+        error = "模式选择不正确。"
+    else:
+        target_kcal, label = deficit_plan(tdee_val, mode_in)
 
-    meta = meta_for(
-        "热量缺口与目标热量 - CalmyHealth",
-        "根据 TDEE 估算减脂/维持/增肌的目标日摄入热量（kcal/天），并提供下一步建议（蛋白质、步数、体重趋势）。",
-        "/deficit",
-    )
     return render_template(
         "deficit.html",
-        meta=meta,
+        meta=_META_DEFICIT,
         error=error,
         tdee_in=tdee_in,
         mode_in=mode_in,
@@ -3438,6 +3692,12 @@ def maintenance_calories_info(
 # 5. 孕期工具
 # ========= 5.1. 基础孕期 ======= 
 ## 5.1.1 预产期计算
+_META_PREGNANCY_DUE_DATE = {
+    "title": "预产期计算器（孕周表格版）- CalmyHealth",
+    "description": "输入末次月经第一天，计算预计预产期、距离预产期天数、当前孕周，并查看完整显示到预产期的孕周表格。",
+    "canonical": _CANON["/pregnancy-due-date"],
+}
+
 @app.route("/pregnancy-due-date", methods=["GET", "POST"])
 def pregnancy_due_date():
     error = None
@@ -3454,12 +3714,6 @@ def pregnancy_due_date():
     demo_current_week = None
     demo_pregnancy_calendar = None
 
-    meta = {
-        "title": "预产期计算器（孕周表格版）- CalmyHealth",
-        "description": "输入末次月经第一天，计算预计预产期、距离预产期天数、当前孕周，并查看完整显示到预产期的孕周表格。",
-        "canonical": canonical_url("/pregnancy-due-date"),
-    }
-
     # -----------------------
     # 先准备未计算时的示例数据
     # 示例逻辑：假设今天大约在孕 12 周
@@ -3483,7 +3737,7 @@ def pregnancy_due_date():
     # 用户提交后计算真实结果
     # -----------------------
     if request.method == "POST":
-        lmp_in = (request.form.get("lmp") or "").strip()
+        lmp_in = _clean(request.form, "lmp")
 
         try:
             if not lmp_in:
@@ -3512,7 +3766,7 @@ def pregnancy_due_date():
 
     return render_template(
         "pregnancy_due_date.html",
-        meta=meta,
+        meta=_META_PREGNANCY_DUE_DATE,
         error=error,
         lmp_in=lmp_in,
         due_date=due_date,
@@ -3527,6 +3781,12 @@ def pregnancy_due_date():
     )
 
 # 5.1.2 怀孕周数
+_META_PREGNANCY_WEEK = {
+    "title": "怀孕周数计算器（实时孕周与预产期）- 健康工具站",
+    "description": "输入末次月经日期，计算当前怀孕周数、孕期阶段、预产期和孕期进度，并提供公式说明与相关孕期工具。",
+    "canonical": _CANON["/pregnancy-week"],
+}
+
 @app.route("/pregnancy-week", methods=["GET", "POST"])
 def pregnancy_week():
     error = None
@@ -3534,33 +3794,33 @@ def pregnancy_week():
     result = None
 
     if request.method == "POST":
-        lmp_in = request.form.get("lmp", "").strip()
+        lmp_in = _clean(request.form, "lmp")
 
         try:
             if not lmp_in:
                 raise ValueError("请输入末次月经日期。")
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
+            lmp_date = parse_date(lmp_in)
             result = pregnancy_week_info(lmp_date)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效日期。"
-
-    meta = {
-        "title": "怀孕周数计算器（实时孕周与预产期）- 健康工具站",
-        "description": "输入末次月经日期，计算当前怀孕周数、孕期阶段、预产期和孕期进度，并提供公式说明与相关孕期工具。",
-        "canonical": canonical_url("/pregnancy-week"),
-    }
+            error = str(e) or "请输入有效日期。"
 
     return render_template(
         "pregnancy_week.html",
-        meta=meta,
+        meta=_META_PREGNANCY_WEEK,
         error=error,
         lmp_in=lmp_in,
         result=result,
         page_kind="tool",
     )
 # 5.1.3 预测排卵日
+_META_OVULATION = {
+    "title": "排卵期计算器（易孕期与排卵日预测）",
+    "description": "输入末次月经和周期长度，计算排卵日、易孕期和下次月经日期。",
+    "canonical": _CANON["/ovulation"],
+}
+
 @app.route("/ovulation", methods=["GET", "POST"])
 def ovulation():
 
@@ -3571,13 +3831,13 @@ def ovulation():
 
     if request.method == "POST":
 
-        lmp_in = request.form.get("lmp", "").strip()
+        lmp_in = _clean(request.form, "lmp")
         cycle_in = request.form.get("cycle", "28")
 
         try:
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
-            cycle_length = int(cycle_in)
+            lmp_date = parse_date(lmp_in)
+            cycle_length = parse_int(cycle_in)
 
             if cycle_length < 21 or cycle_length > 45:
                 raise ValueError("月经周期通常在21–45天之间")
@@ -3587,15 +3847,9 @@ def ovulation():
         except Exception as e:
             error = str(e)
 
-    meta = {
-        "title": "排卵期计算器（易孕期与排卵日预测）",
-        "description": "输入末次月经和周期长度，计算排卵日、易孕期和下次月经日期。",
-        "canonical": canonical_url("/ovulation"),
-    }
-
     return render_template(
         "ovulation.html",
-        meta=meta,
+        meta=_META_OVULATION,
         result=result,
         error=error,
         lmp_in=lmp_in,
@@ -3603,6 +3857,12 @@ def ovulation():
         page_kind="tool",
     )
 # 5.1.4 受孕日期
+_META_CONCEPTION_DATE = {
+    "title": "受孕日期推算器（宝宝大概什么时候怀上的）",
+    "description": "根据末次月经推算可能的受孕日期，同时显示预产期参考。",
+    "canonical": _CANON["/conception-date"],
+}
+
 @app.route("/conception-date", methods=["GET", "POST"])
 def conception_date():
 
@@ -3612,32 +3872,32 @@ def conception_date():
 
     if request.method == "POST":
 
-        lmp_in = request.form.get("lmp", "").strip()
+        lmp_in = _clean(request.form, "lmp")
 
         try:
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
+            lmp_date = parse_date(lmp_in)
 
             result = conception_info(lmp_date)
 
         except Exception:
             error = "请输入有效日期"
 
-    meta = {
-        "title": "受孕日期推算器（宝宝大概什么时候怀上的）",
-        "description": "根据末次月经推算可能的受孕日期，同时显示预产期参考。",
-        "canonical": canonical_url("/conception-date"),
-    }
-
     return render_template(
         "conception_date.html",
-        meta=meta,
+        meta=_META_CONCEPTION_DATE,
         result=result,
         error=error,
         lmp_in=lmp_in,
         page_kind="tool",
     )
 # 5.1.5 月经周期
+_META_PERIOD_CALCULATOR = {
+    "title": "月经周期计算器（下次月经 / 排卵期预测）- CalmyHealth",
+    "description": "输入末次月经开始日期、平均周期长度和经期时长，预测下次月经时间、排卵日和易孕期范围。",
+    "canonical": _CANON["/period-calculator"],
+}
+
 @app.route("/period-calculator", methods=["GET", "POST"])
 def period_calculator():
     error = None
@@ -3648,32 +3908,26 @@ def period_calculator():
     period_in = "5"
 
     if request.method == "POST":
-        lmp_in = request.form.get("lmp", "").strip()
-        cycle_in = request.form.get("cycle_length", "28").strip()
-        period_in = request.form.get("period_length", "5").strip()
+        lmp_in = _clean(request.form, "lmp")
+        cycle_in = _clean(request.form, "cycle_length", "28")
+        period_in = _clean(request.form, "period_length", "5")
 
         try:
             if not lmp_in:
                 raise ValueError("请输入末次月经开始日期。")
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
-            cycle_length = int(cycle_in)
-            period_length = int(period_in)
+            lmp_date = parse_date(lmp_in)
+            cycle_length = parse_int(cycle_in)
+            period_length = parse_int(period_in)
 
             result = period_cycle_info(lmp_date, cycle_length, period_length)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "月经周期计算器（下次月经 / 排卵期预测）- CalmyHealth",
-        "description": "输入末次月经开始日期、平均周期长度和经期时长，预测下次月经时间、排卵日和易孕期范围。",
-        "canonical": canonical_url("/period-calculator"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "period_calculator.html",
-        meta=meta,
+        meta=_META_PERIOD_CALCULATOR,
         error=error,
         result=result,
         lmp_in=lmp_in,
@@ -3682,6 +3936,12 @@ def period_calculator():
         page_kind="tool",
     )
 # 5.1.6 安全期计算
+_META_SAFE_DAYS_CALCULATOR = {
+    "title": "安全期计算器（月经周期参考）- CalmyHealth",
+    "description": "输入末次月经开始日期、平均周期长度和经期时长，估算周期中的相对低受孕概率日期、排卵日和易孕期范围，仅供周期参考。",
+    "canonical": _CANON["/safe-days-calculator"],
+}
+
 @app.route("/safe-days-calculator", methods=["GET", "POST"])
 def safe_days_calculator():
     error = None
@@ -3692,32 +3952,26 @@ def safe_days_calculator():
     period_in = "5"
 
     if request.method == "POST":
-        lmp_in = request.form.get("lmp", "").strip()
-        cycle_in = request.form.get("cycle_length", "28").strip()
-        period_in = request.form.get("period_length", "5").strip()
+        lmp_in = _clean(request.form, "lmp")
+        cycle_in = _clean(request.form, "cycle_length", "28")
+        period_in = _clean(request.form, "period_length", "5")
 
         try:
             if not lmp_in:
                 raise ValueError("请输入末次月经开始日期。")
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
-            cycle_length = int(cycle_in)
-            period_length = int(period_in)
+            lmp_date = parse_date(lmp_in)
+            cycle_length = parse_int(cycle_in)
+            period_length = parse_int(period_in)
 
             result = safe_days_info(lmp_date, cycle_length, period_length)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "安全期计算器（月经周期参考）- CalmyHealth",
-        "description": "输入末次月经开始日期、平均周期长度和经期时长，估算周期中的相对低受孕概率日期、排卵日和易孕期范围，仅供周期参考。",
-        "canonical": canonical_url("/safe-days-calculator"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "safe_days_calculator.html",
-        meta=meta,
+        meta=_META_SAFE_DAYS_CALCULATOR,
         error=error,
         result=result,
         lmp_in=lmp_in,
@@ -3726,6 +3980,12 @@ def safe_days_calculator():
         page_kind="tool",
     )
 # 5.1.7 易孕期计算
+_META_FERTILITY_CALCULATOR = {
+    "title": "易孕期计算器（Fertility Calculator）- CalmyHealth",
+    "description": "输入末次月经开始日期和平均周期长度，预测排卵日、易孕期范围和相对更高受孕概率的日期窗口。",
+    "canonical": _CANON["/fertility-calculator"],
+}
+
 @app.route("/fertility-calculator", methods=["GET", "POST"])
 def fertility_calculator():
     error = None
@@ -3735,30 +3995,24 @@ def fertility_calculator():
     cycle_in = "28"
 
     if request.method == "POST":
-        lmp_in = request.form.get("lmp", "").strip()
-        cycle_in = request.form.get("cycle_length", "28").strip()
+        lmp_in = _clean(request.form, "lmp")
+        cycle_in = _clean(request.form, "cycle_length", "28")
 
         try:
             if not lmp_in:
                 raise ValueError("请输入末次月经开始日期。")
 
-            lmp_date = datetime.strptime(lmp_in, "%Y-%m-%d").date()
-            cycle_length = int(cycle_in)
+            lmp_date = parse_date(lmp_in)
+            cycle_length = parse_int(cycle_in)
 
             result = fertility_window_info(lmp_date, cycle_length)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "易孕期计算器（Fertility Calculator）- CalmyHealth",
-        "description": "输入末次月经开始日期和平均周期长度，预测排卵日、易孕期范围和相对更高受孕概率的日期窗口。",
-        "canonical": canonical_url("/fertility-calculator"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "fertility_calculator.html",
-        meta=meta,
+        meta=_META_FERTILITY_CALCULATOR,
         error=error,
         result=result,
         lmp_in=lmp_in,
@@ -3768,6 +4022,12 @@ def fertility_calculator():
 # 5.1.8 着床时间
 # ========= 5.2. 孕期健康 ======= 
 # 5.2.1 孕期体重增长
+_META_PREGNANCY_WEIGHT = {
+    "title": "孕期体重增长计算器（Pregnancy Weight Gain Calculator）",
+    "description": "根据孕前BMI计算孕期建议体重增长范围，并提供医学参考标准。",
+    "canonical": _CANON["/pregnancy-weight"],
+}
+
 @app.route("/pregnancy-weight", methods=["GET", "POST"])
 def pregnancy_weight():
 
@@ -3783,23 +4043,17 @@ def pregnancy_weight():
 
         try:
 
-            height = float(height_in)
-            weight = float(weight_in)
+            height = parse_float(height_in)
+            weight = parse_float(weight_in)
 
             result = pregnancy_weight_gain(height, weight)
 
         except Exception:
             error = "请输入有效身高和体重"
 
-    meta = {
-        "title": "孕期体重增长计算器（Pregnancy Weight Gain Calculator）",
-        "description": "根据孕前BMI计算孕期建议体重增长范围，并提供医学参考标准。",
-        "canonical": canonical_url("/pregnancy-weight"),
-    }
-
     return render_template(
         "pregnancy_weight.html",
-        meta=meta,
+        meta=_META_PREGNANCY_WEIGHT,
         result=result,
         error=error,
         height_in=height_in,
@@ -3807,6 +4061,12 @@ def pregnancy_weight():
         page_kind="tool",
     )
 # 5.2.2 孕期热量需求 
+_META_PREGNANCY_CALORIE = {
+    "title": "孕期热量需求计算器（不同孕期每天该吃多少热量）- CalmyHealth",
+    "description": "输入基础每日热量并选择孕期阶段，估算孕早期、孕中期、孕晚期每天建议摄入热量，并附公式说明、图表展示与相关孕期工具。",
+    "canonical": _CANON["/pregnancy-calorie"],
+}
+
 @app.route("/pregnancy-calorie", methods=["GET", "POST"])
 def pregnancy_calorie():
     error = None
@@ -3815,11 +4075,11 @@ def pregnancy_calorie():
     result = None
 
     if request.method == "POST":
-        base_kcal_in = request.form.get("base_kcal", "").strip()
+        base_kcal_in = _clean(request.form, "base_kcal")
         trimester_in = request.form.get("trimester", "first")
 
         try:
-            base_kcal = float(base_kcal_in)
+            base_kcal = parse_float(base_kcal_in)
 
             if base_kcal <= 0 or base_kcal > 10000:
                 raise ValueError("请输入合理的基础热量（kcal/天）。")
@@ -3827,17 +4087,11 @@ def pregnancy_calorie():
             result = pregnancy_calorie_need(base_kcal, trimester_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "孕期热量需求计算器（不同孕期每天该吃多少热量）- CalmyHealth",
-        "description": "输入基础每日热量并选择孕期阶段，估算孕早期、孕中期、孕晚期每天建议摄入热量，并附公式说明、图表展示与相关孕期工具。",
-        "canonical": canonical_url("/pregnancy-calorie"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "pregnancy_calorie.html",
-        meta=meta,
+        meta=_META_PREGNANCY_CALORIE,
         error=error,
         base_kcal_in=base_kcal_in,
         trimester_in=trimester_in,
@@ -3845,6 +4099,12 @@ def pregnancy_calorie():
         page_kind="tool",
     )
 # 5.2.3 孕期蛋白质
+_META_PREGNANCY_PROTEIN = {
+    "title": "孕期蛋白质需求计算器（怀孕后每天蛋白质该吃多少）- CalmyHealth",
+    "description": "输入体重并选择孕期阶段，估算孕期每天蛋白质摄入建议，并附公式说明、结果图示和相关孕期工具内链。",
+    "canonical": _CANON["/pregnancy-protein"],
+}
+
 @app.route("/pregnancy-protein", methods=["GET", "POST"])
 def pregnancy_protein():
     error = None
@@ -3853,24 +4113,18 @@ def pregnancy_protein():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
         trimester_in = request.form.get("trimester", "first")
 
         try:
-            weight_kg = float(weight_kg_in)
+            weight_kg = parse_float(weight_kg_in)
             result = pregnancy_protein_need(weight_kg, trimester_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "孕期蛋白质需求计算器（怀孕后每天蛋白质该吃多少）- CalmyHealth",
-        "description": "输入体重并选择孕期阶段，估算孕期每天蛋白质摄入建议，并附公式说明、结果图示和相关孕期工具内链。",
-        "canonical": canonical_url("/pregnancy-protein"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "pregnancy_protein.html",
-        meta=meta,
+        meta=_META_PREGNANCY_PROTEIN,
         error=error,
         weight_kg_in=weight_kg_in,
         trimester_in=trimester_in,
@@ -3878,6 +4132,12 @@ def pregnancy_protein():
         page_kind="tool",
     )
 # 5.2.4 胎儿发育周数
+_META_FETAL_DEVELOPMENT = {
+    "title": "胎儿发育周数图（孕周发育进度查询）- CalmyHealth",
+    "description": "输入孕周，查看胎儿发育阶段、40周进度和本周常见发育特点，并推荐相关孕期工具。",
+    "canonical": _CANON["/fetal-development"],
+}
+
 @app.route("/fetal-development", methods=["GET", "POST"])
 def fetal_development():
     error = None
@@ -3885,29 +4145,29 @@ def fetal_development():
     result = None
 
     if request.method == "POST":
-        week_in = request.form.get("week", "").strip()
+        week_in = _clean(request.form, "week")
 
         try:
-            week = int(week_in)
+            week = parse_int(week_in)
             result = fetal_development_data(week)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效的孕周。"
-
-    meta = {
-        "title": "胎儿发育周数图（孕周发育进度查询）- CalmyHealth",
-        "description": "输入孕周，查看胎儿发育阶段、40周进度和本周常见发育特点，并推荐相关孕期工具。",
-        "canonical": canonical_url("/fetal-development"),
-    }
+            error = str(e) or "请输入有效的孕周。"
 
     return render_template(
         "fetal_development.html",
-        meta=meta,
+        meta=_META_FETAL_DEVELOPMENT,
         error=error,
         week_in=week_in,
         result=result,
         page_kind="tool",
     )
 # 5.2.5 孕期饮水量
+_META_PREGNANCY_WATER = {
+    "title": "孕期饮水量计算器（怀孕后每天建议喝多少水）- CalmyHealth",
+    "description": "输入体重并选择孕期阶段，估算孕期每天建议饮水量，并附结果说明、公式解释和相关孕期工具内链。",
+    "canonical": _CANON["/pregnancy-water"],
+}
+
 @app.route("/pregnancy-water", methods=["GET", "POST"])
 def pregnancy_water():
     error = None
@@ -3916,24 +4176,18 @@ def pregnancy_water():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
         trimester_in = request.form.get("trimester", "first")
 
         try:
-            weight_kg = float(weight_kg_in)
+            weight_kg = parse_float(weight_kg_in)
             result = pregnancy_water_need(weight_kg, trimester_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "孕期饮水量计算器（怀孕后每天建议喝多少水）- CalmyHealth",
-        "description": "输入体重并选择孕期阶段，估算孕期每天建议饮水量，并附结果说明、公式解释和相关孕期工具内链。",
-        "canonical": canonical_url("/pregnancy-water"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "pregnancy_water.html",
-        meta=meta,
+        meta=_META_PREGNANCY_WATER,
         error=error,
         weight_kg_in=weight_kg_in,
         trimester_in=trimester_in,
@@ -3948,44 +4202,53 @@ def pregnancy_water():
 # 2. 代谢与热量
 # ========= 2.1. 基础代谢 ======= 
 ## 2.1.1 基础代谢率BMR
+_META_BMR = meta_for(
+    "基础代谢率 BMR - CalmyHealth",
+    "在线 BMR 计算器：使用 Mifflin-St Jeor 公式估算基础代谢率（kcal/天），并提供用途说明与下一步工具推荐（TDEE、BMI 等）。",
+    "/bmr",
+)
+
+_BMR_GET_CTX = {
+    "meta": _META_BMR,
+    "error": None,
+    "bmr": None,
+    "sex_in": "male",
+    "age_in": "",
+    "height_cm_in": "",
+    "weight_kg_in": "",
+}
+
 @app.route("/bmr", methods=["GET", "POST"])
 def bmr():
+    if request.method != "POST":
+        return render_template("bmr.html", **_BMR_GET_CTX)
+
     error = None
     bmr_val = None
-    sex_in = "male"
-    age_in = ""
-    height_cm_in = ""
-    weight_kg_in = ""
-
-    if request.method == "POST":
-        sex_in = request.form.get("sex", "male")
-        age_in = request.form.get("age", "")
-        height_cm_in = request.form.get("height_cm", "")
-        weight_kg_in = request.form.get("weight_kg", "")
 
-        age = to_int(age_in)
-        h = to_float(height_cm_in)
-        w = to_float(weight_kg_in)
-
-        if sex_in not in ("male", "female"):
-            error = "性别选择不正确。"
-        elif age is None or age <= 0 or age > 120:
-            error = "请输入正确年龄。"
-        elif not h or h <= 0 or h > 250:
-            error = "请输入正确身高（cm）。"
-        elif not w or w <= 0 or w > 300:
-            error = "请输入正确体重（kg）。"
-        else:
-            bmr_val = round0(mifflin_st_jeor(sex_in, age, h, w))
+    sex_in = request.form.get("sex", "male")
+    age_in = request.form.get("age", "")
+    height_cm_in = request.form.get("height_cm", "")
+    weight_kg_in = request.form.get("weight_kg", "")
+
+    age = to_int(age_in)
+    h = _parse_positive_float(height_cm_in, 0, 250)
+    w = _parse_positive_float(weight_kg_in, 0, 300)
+
+    if sex_in not in ("male", "female"):
+        error = "性别选择不正确。"
+    elif not _in_range(age, 0, 120):
+        error = "请输入正确年龄。"
+    elif h is None:
+        error = "请输入正确身高（cm）。"
+    elif w is None:
+        error = "请输入正确体重（kg）。"
+    else:
+        bmr_val, _ = mifflin_calc(sex_in == "male", age, h, w, 1.0)
 
-    meta = meta_for(
-        "基础代谢率 BMR - CalmyHealth",
-        "在线 BMR 计算器：使用 Mifflin-St Jeor 公式估算基础代谢率（kcal/天），并提供用途说明与下一步工具推荐（TDEE、BMI 等）。",
-        "/bmr",
-    )
     return render_template(
         "bmr.html",
-        meta=meta,
+        meta=_META_BMR,
         error=error,
         bmr=bmr_val,
         sex_in=sex_in,
@@ -4000,40 +4263,49 @@ def bmr():
 # 1. 体重与体型
 # ========= 1.1. BMI与体重 ======= 
 # 1.1.3 目标体重 (Route)
+_META_GOAL_TIME = meta_for(
+    "目标体重所需时间 - CalmyHealth",
+    "目标体重时间估算：输入当前体重、目标体重与每周变化速度，估算达到目标所需周数，并给出建议与相关工具链接。",
+    "/goal-time",
+)
+
+_GOAL_TIME_GET_CTX = {
+    "meta": _META_GOAL_TIME,
+    "error": None,
+    "current_in": "",
+    "target_in": "",
+    "rate_in": "0.5",
+    "weeks": None,
+}
+
 @app.route("/goal-time", methods=["GET", "POST"])
 def goal_time():
+    if request.method != "POST":
+        return render_template("goal_time.html", **_GOAL_TIME_GET_CTX)
+
     error = None
-    current_in = ""
-    target_in = ""
-    rate_in = "0.5"
     weeks = None
 
-    if request.method == "POST":
-        current_in = request.form.get("current_kg", "")
-        target_in = request.form.get("target_kg", "")
-        rate_in = request.form.get("rate", "0.5")
-
-        c = to_float(current_in)
-        t = to_float(target_in)
-        r = to_float(rate_in)
-
-        if not c or c <= 0 or c > 300:
-            error = "请输入正确当前体重（kg）。"
-        elif not t or t <= 0 or t > 300:
-            error = "请输入正确目标体重（kg）。"
-        elif not r or r <= 0 or r > 2.0:
-            error = "请输入合理的每周变化速度（建议 0.25–1.0 kg/周）。"
-        else:
-            weeks = round1(weeks_to_goal(c, t, r))
+    current_in = request.form.get("current_kg", "")
+    target_in = request.form.get("target_kg", "")
+    rate_in = request.form.get("rate", "0.5")
+
+    c = to_float(current_in)
+    t = to_float(target_in)
+    r = to_float(rate_in)
+
+    if not _in_range(c, 0, 300):
+        error = "请输入正确当前体重（kg）。"
+    elif not _in_range(t, 0, 300):
+        error = "请输入正确目标体重（kg）。"
+    elif not _in_range(r, 0, 2.0):
+        error = "请输入合理的每周变化速度（建议 0.25–1.0 kg/周）。"
+    else:
+        weeks = round1(weeks_to_goal(c, t, r))
 
-    meta = meta_for(
-        "目标体重所需时间 - CalmyHealth",
-        "目标体重时间估算：输入当前体重、目标体重与每周变化速度，估算达到目标所需周数，并给出建议与相关工具链接。",
-        "/goal-time",
-    )
     return render_template(
         "goal_time.html",
-        meta=meta,
+        meta=_META_GOAL_TIME,
         error=error,
         current_in=current_in,
         target_in=target_in,
@@ -4046,59 +4318,84 @@ def goal_time():
 # -----------------------
 # ========= 2.2. 热量规划 ======= 
 ## 2.2.1 每日热量需求 
+_META_CALORIE = meta_for(
+    "每日热量需求 TDEE - CalmyHealth",
+    "在线 TDEE 计算器：基于 BMR 与活动水平估算每日总能量消耗，并提供减脂/维持/增肌使用建议与相关工具链接。",
+    "/calorie",
+)
+
+# /calorie 的活动系数选项（value -> 说明），只读
+ACTIVITY_LEVELS = MappingProxyType({
+    "1.2": "久坐（几乎不运动）",
+    "1.375": "轻度活动（每周 1–3 次）",
+    "1.55": "中度活动（每周 3–5 次）",
+    "1.725": "较高活动（每周 6–7 次）",
+    "1.9": "非常高（体力劳动 / 高强度训练）",
+})
+
+_CALORIE_GET_CTX = {
+    "meta": _META_CALORIE,
+    "error": None,
+    "tdee": None,
+    "sex_in": "male",
+    "age_in": "",
+    "height_cm_in": "",
+    "weight_kg_in": "",
+    "activity_in": "1.2",
+    "activity_levels": ACTIVITY_LEVELS,
+}
+
 @app.route("/calorie", methods=["GET", "POST"])
 def calorie():
+    if request.method != "POST":
+        return render_template("calorie.html", **_CALORIE_GET_CTX)
+
     error = None
     tdee_val = None
-    sex_in = "male"
-    age_in = ""
-    height_cm_in = ""
-    weight_kg_in = ""
-    activity_in = "1.2"
-
-    if request.method == "POST":
-        sex_in = request.form.get("sex", "male")
-        age_in = request.form.get("age", "")
-        height_cm_in = request.form.get("height_cm", "")
-        weight_kg_in = request.form.get("weight_kg", "")
-        activity_in = request.form.get("activity", "1.2")
 
-        age = to_int(age_in)
-        h = to_float(height_cm_in)
-        w = to_float(weight_kg_in)
-        act = to_float(activity_in)
-
-        if sex_in not in ("male", "female"):
-            error = "性别选择不正确。"
-        elif age is None or age <= 0 or age > 120:
-            error = "请输入正确年龄。"
-        elif not h or h <= 0 or h > 250:
-            error = "请输入正确身高（cm）。"
-        elif not w or w <= 0 or w > 300:
-            error = "请输入正确体重（kg）。"
-        elif not act or act < 1.1 or act > 2.5:
-            error = "活动水平不正确。"
-        else:
-            b = mifflin_st_jeor(sex_in, age, h, w)
-            tdee_val = round0(b * act)
+    sex_in = request.form.get("sex", "male")
+    age_in = request.form.get("age", "")
+    height_cm_in = request.form.get("height_cm", "")
+    weight_kg_in = request.form.get("weight_kg", "")
+    activity_in = request.form.get("activity", "1.2")
+
+    age = to_int(age_in)
+    h = _parse_positive_float(height_cm_in, 0, 250)
+    w = _parse_positive_float(weight_kg_in, 0, 300)
+    act = to_float(activity_in)
+
+    if sex_in not in ("male", "female"):
+        error = "性别选择不正确。"
+    elif not _in_range(age, 0, 120):
+        error = "请输入正确年龄。"
+    elif h is None:
+        error = "请输入正确身高（cm）。"
+    elif w is None:
+        error = "请输入正确体重（kg）。"
+    elif act is None or not 1.1 <= act <= 2.5:
+        error = "活动水平不正确。"
+    else:
+        _, tdee_val = mifflin_calc(sex_in == "male", age, h, w, act)
 
-    meta = meta_for(
-        "每日热量需求 TDEE - CalmyHealth",
-        "在线 TDEE 计算器：基于 BMR 与活动水平估算每日总能量消耗，并提供减脂/维持/增肌使用建议与相关工具链接。",
-        "/calorie",
-    )
     return render_template(
         "calorie.html",
-        meta=meta,
+        meta=_META_CALORIE,
         error=error,
         tdee=tdee_val,
         sex_in=sex_in,
         age_in=age_in,
         height_cm_in=height_cm_in,
         weight_kg_in=weight_kg_in,
-        activity_in=str(activity_in),
+        activity_in=activity_in,
+        activity_levels=ACTIVITY_LEVELS,
     )
 # 2.2.3 维持体重
+_META_MAINTENANCE_CALORIES = {
+    "title": "维持体重热量计算器（Maintenance Calories）- CalmyHealth",
+    "description": "输入性别、年龄、身高、体重和活动水平，估算维持当前体重所需热量，并查看轻度减脂、常见减脂和温和增肌的热量参考。",
+    "canonical": _CANON["/maintenance-calories"],
+}
+
 @app.route("/maintenance-calories", methods=["GET", "POST"])
 def maintenance_calories():
     error = None
@@ -4111,17 +4408,17 @@ def maintenance_calories():
     activity_in = "1.375"
 
     if request.method == "POST":
-        sex_in = request.form.get("sex", "male").strip()
-        age_in = request.form.get("age", "").strip()
-        height_cm_in = request.form.get("height_cm", "").strip()
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        activity_in = request.form.get("activity", "1.375").strip()
+        sex_in = _clean(request.form, "sex", "male")
+        age_in = _clean(request.form, "age")
+        height_cm_in = _clean(request.form, "height_cm")
+        weight_kg_in = _clean(request.form, "weight_kg")
+        activity_in = _clean(request.form, "activity", "1.375")
 
         try:
-            age = int(age_in)
-            height_cm = float(height_cm_in)
-            weight_kg = float(weight_kg_in)
-            activity_factor = float(activity_in)
+            age = parse_int(age_in)
+            height_cm = parse_float(height_cm_in)
+            weight_kg = parse_float(weight_kg_in)
+            activity_factor = parse_float(activity_in)
 
             result = maintenance_calories_info(
                 sex_in,
@@ -4132,17 +4429,11 @@ def maintenance_calories():
             )
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "维持体重热量计算器（Maintenance Calories）- CalmyHealth",
-        "description": "输入性别、年龄、身高、体重和活动水平，估算维持当前体重所需热量，并查看轻度减脂、常见减脂和温和增肌的热量参考。",
-        "canonical": canonical_url("/maintenance-calories"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "maintenance_calories.html",
-        meta=meta,
+        meta=_META_MAINTENANCE_CALORIES,
         error=error,
         result=result,
         sex_in=sex_in,
@@ -4158,30 +4449,45 @@ def maintenance_calories():
 # 3. 营养摄入
 # ========= 3.1. 日常摄入 ======= 
 ## 3.1.1. 饮水
+_META_WATER = meta_for(
+    "每日饮水量计算 - CalmyHealth",
+    "按体重估算每日饮水量建议（ml/L），并提供影响因素与实践建议。免费在线工具。",
+    "/water",
+)
+
+def water_need(weight_kg: float) -> tuple[int, float]:
+    # 每公斤体重约 33 ml
+    water_ml = round0(weight_kg * 33.0)
+    return water_ml, round1(water_ml / 1000.0)
+
+
+_WATER_GET_CTX = {
+    "meta": _META_WATER,
+    "error": None,
+    "water_ml": None,
+    "water_l": None,
+    "weight_kg_in": "",
+}
+
 @app.route("/water", methods=["GET", "POST"])
 def water():
+    if request.method != "POST":
+        return render_template("water.html", **_WATER_GET_CTX)
+
     error = None
     water_ml = None
     water_l = None
-    weight_kg_in = ""
 
-    if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "")
-        w = to_float(weight_kg_in)
-        if not w or w <= 0 or w > 300:
-            error = "请输入正确体重（kg）。"
-        else:
-            water_ml = round0(w * 33.0)
-            water_l = round1(water_ml / 1000.0)
+    weight_kg_in = request.form.get("weight_kg", "")
+    w = _parse_positive_float(weight_kg_in, 0, 300)
+    if w is None:
+        error = "请输入正确体重（kg）。"
+    else:
+        water_ml, water_l = water_need(w)
 
-    meta = meta_for(
-        "每日饮水量计算 - CalmyHealth",
-        "按体重估算每日饮水量建议（ml/L），并提供影响因素与实践建议。免费在线工具。",
-        "/water",
-    )
     return render_template(
         "water.html",
-        meta=meta,
+        meta=_META_WATER,
         error=error,
         water_ml=water_ml,
         water_l=water_l,
@@ -4194,65 +4500,65 @@ def water():
 # -----------------------
 # ========= 4.2. 睡眠时间 ======= 
 ## 4.2.1 睡眠周期
+_META_SLEEP = meta_for(
+    "睡眠周期计算 - CalmyHealth",
+    "睡眠周期计算器：按 90 分钟周期给出推荐入睡/起床时间点，适合做作息规划（仅供参考）。",
+    "/sleep",
+)
+
+# /sleep：入睡缓冲 15 分钟，每个睡眠周期 90 分钟，给出 3–6 个周期的时间
+SLEEP_BUFFER_MIN = 15
+SLEEP_CYCLE_MIN = 90
+SLEEP_CYCLE_OPTIONS = (3, 4, 5, 6)
+# 与 sleep.html 的两个选项对应
+SLEEP_MODES = ("sleep_now", "wake_at")
+
+def sleep_cycle_times(mode: str, h: int, m: int) -> list[str]:
+    """
+    sleep_now: 现在入睡 -> 建议起床时间
+    其他: 输入起床时间 -> 建议入睡时间
+    """
+    times = []
+    if mode == "sleep_now":
+        start_h, start_m = add_minutes(h, m, SLEEP_BUFFER_MIN)
+        for c in SLEEP_CYCLE_OPTIONS:
+            th, tm = add_minutes(start_h, start_m, c * SLEEP_CYCLE_MIN)
+            times.append(fmt_hm(th, tm))
+    else:
+        for c in SLEEP_CYCLE_OPTIONS:
+            th, tm = add_minutes(h, m, -(c * SLEEP_CYCLE_MIN) - SLEEP_BUFFER_MIN)
+            times.append(fmt_hm(th, tm))
+    return times
+
+
+_SLEEP_GET_CTX = {
+    "meta": _META_SLEEP,
+    "error": None,
+    "mode_in": "sleep_now",
+    "time_hm_in": "",
+    "times": (),
+}
+
 @app.route("/sleep", methods=["GET", "POST"])
 def sleep():
+    if request.method != "POST":
+        return render_template("sleep.html", **_SLEEP_GET_CTX)
+
     error = None
-    mode_in = "sleep_now"
-    time_hm_in = ""
     times = []
 
-    def parse_hm(s: str):
-        s = s.strip()
-        if ":" not in s:
-            return None
-        hh, mm = s.split(":", 1)
-        h = to_int(hh)
-        m = to_int(mm)
-        if h is None or m is None:
-            return None
-        if h < 0 or h > 23 or m < 0 or m > 59:
-            return None
-        return h, m
-
-    def fmt(h: int, m: int) -> str:
-        return f"{h:02d}:{m:02d}"
-
-    def add_minutes(h: int, m: int, minutes: int) -> tuple[int, int]:
-        total = h * 60 + m + minutes
-        total %= 24 * 60
-        return total // 60, total % 60
+    mode_in = request.form.get("mode", "sleep_now")
+    time_hm_in = request.form.get("time_hm", "")
+    hm = parse_hm(time_hm_in)
 
-    if request.method == "POST":
-        mode_in = request.form.get("mode", "sleep_now")
-        time_hm_in = request.form.get("time_hm", "")
-        hm = parse_hm(time_hm_in)
+    if hm is None:
+        error = "请输入正确时间（例如 23:30）。"
+    else:
+        times = sleep_cycle_times(mode_in, *hm)
 
-        if hm is None:
-            error = "请输入正确时间（例如 23:30）。"
-        else:
-            h, m = hm
-            buffer_min = 15
-            cycle = 90
-            options = [3, 4, 5, 6]
-
-            if mode_in == "sleep_now":
-                start_h, start_m = add_minutes(h, m, buffer_min)
-                for c in options:
-                    th, tm = add_minutes(start_h, start_m, c * cycle)
-                    times.append(fmt(th, tm))
-            else:
-                for c in options:
-                    th, tm = add_minutes(h, m, -(c * cycle) - buffer_min)
-                    times.append(fmt(th, tm))
-
-    meta = meta_for(
-        "睡眠周期计算 - CalmyHealth",
-        "睡眠周期计算器：按 90 分钟周期给出推荐入睡/起床时间点，适合做作息规划（仅供参考）。",
-        "/sleep",
-    )
     return render_template(
         "sleep.html",
-        meta=meta,
+        meta=_META_SLEEP,
         error=error,
         mode_in=mode_in,
         time_hm_in=time_hm_in,
@@ -4260,6 +4566,12 @@ def sleep():
     )
 # ========= 4.3. 睡眠质量 ======= 
 ## 4.3.1 睡眠债
+_META_SLEEP_DEBT = {
+    "title": "睡眠债计算器（这一周你到底欠了多少睡眠）- CalmyHealth",
+    "description": "输入平均实际睡眠时长、目标睡眠时长和统计天数，估算累计睡眠债，并附结果说明、公式解释和相关睡眠工具推荐。",
+    "canonical": _CANON["/sleep-debt"],
+}
+
 @app.route("/sleep-debt", methods=["GET", "POST"])
 def sleep_debt():
     error = None
@@ -4269,29 +4581,23 @@ def sleep_debt():
     result = None
 
     if request.method == "POST":
-        actual_in = request.form.get("actual_hours", "6.5").strip()
-        target_in = request.form.get("target_hours", "8").strip()
-        days_in = request.form.get("days", "7").strip()
+        actual_in = _clean(request.form, "actual_hours", "6.5")
+        target_in = _clean(request.form, "target_hours", "8")
+        days_in = _clean(request.form, "days", "7")
 
         try:
-            actual_hours = float(actual_in)
-            target_hours = float(target_in)
-            days = int(days_in)
+            actual_hours = parse_float(actual_in)
+            target_hours = parse_float(target_in)
+            days = parse_int(days_in)
 
             result = sleep_debt_info(actual_hours, target_hours, days)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "睡眠债计算器（这一周你到底欠了多少睡眠）- CalmyHealth",
-        "description": "输入平均实际睡眠时长、目标睡眠时长和统计天数，估算累计睡眠债，并附结果说明、公式解释和相关睡眠工具推荐。",
-        "canonical": canonical_url("/sleep-debt"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "sleep_debt.html",
-        meta=meta,
+        meta=_META_SLEEP_DEBT,
         error=error,
         actual_in=actual_in,
         target_in=target_in,
@@ -4301,6 +4607,12 @@ def sleep_debt():
     )
 # ========= 4.2. 睡眠时间 ======= 
 ## 4.2.4 补觉时间 (Route)
+_META_SLEEP_RECOVERY = {
+    "title": "补觉时间计算器（睡不够后大概要补多久）- CalmyHealth",
+    "description": "输入累计睡眠债和你计划每天额外补觉的时长，估算大概需要多少天恢复，并附结果说明、公式解释和相关睡眠工具推荐。",
+    "canonical": _CANON["/sleep-recovery"],
+}
+
 @app.route("/sleep-recovery", methods=["GET", "POST"])
 def sleep_recovery():
     error = None
@@ -4309,25 +4621,19 @@ def sleep_recovery():
     result = None
 
     if request.method == "POST":
-        debt_in = request.form.get("debt_hours", "6").strip()
-        recovery_in = request.form.get("recovery_hours", "1").strip()
+        debt_in = _clean(request.form, "debt_hours", "6")
+        recovery_in = _clean(request.form, "recovery_hours", "1")
 
         try:
-            debt_hours = float(debt_in)
-            recovery_hours = float(recovery_in)
+            debt_hours = parse_float(debt_in)
+            recovery_hours = parse_float(recovery_in)
             result = sleep_recovery_info(debt_hours, recovery_hours)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "补觉时间计算器（睡不够后大概要补多久）- CalmyHealth",
-        "description": "输入累计睡眠债和你计划每天额外补觉的时长，估算大概需要多少天恢复，并附结果说明、公式解释和相关睡眠工具推荐。",
-        "canonical": canonical_url("/sleep-recovery"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "sleep_recovery.html",
-        meta=meta,
+        meta=_META_SLEEP_RECOVERY,
         error=error,
         debt_in=debt_in,
         recovery_in=recovery_in,
@@ -4335,6 +4641,12 @@ def sleep_recovery():
         page_kind="tool",
     )
 # 4.2.3 睡眠时长
+_META_SLEEP_DURATION = {
+    "title": "睡眠时长计算器（从几点睡到几点起一共睡了多久）- CalmyHealth",
+    "description": "输入入睡时间、起床时间和目标睡眠时长，计算总睡眠时间、和目标的差距，并附时间轴展示、公式说明与相关睡眠工具推荐。",
+    "canonical": _CANON["/sleep-duration"],
+}
+
 @app.route("/sleep-duration", methods=["GET", "POST"])
 def sleep_duration():
     error = None
@@ -4344,29 +4656,23 @@ def sleep_duration():
     result = None
 
     if request.method == "POST":
-        bed_in = request.form.get("bed_hm", "23:30").strip()
-        wake_in = request.form.get("wake_hm", "07:00").strip()
-        target_in = request.form.get("target_hours", "8").strip()
+        bed_in = _clean(request.form, "bed_hm", "23:30")
+        wake_in = _clean(request.form, "wake_hm", "07:00")
+        target_in = _clean(request.form, "target_hours", "8")
 
         try:
-            target_hours = float(target_in)
+            target_hours = parse_float(target_in)
             if target_hours <= 0 or target_hours > 24:
                 raise ValueError("请输入合理的目标睡眠时长。")
 
             result = sleep_duration_info(bed_in, wake_in, target_hours)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "睡眠时长计算器（从几点睡到几点起一共睡了多久）- CalmyHealth",
-        "description": "输入入睡时间、起床时间和目标睡眠时长，计算总睡眠时间、和目标的差距，并附时间轴展示、公式说明与相关睡眠工具推荐。",
-        "canonical": canonical_url("/sleep-duration"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "sleep_duration.html",
-        meta=meta,
+        meta=_META_SLEEP_DURATION,
         error=error,
         bed_in=bed_in,
         wake_in=wake_in,
@@ -4375,6 +4681,12 @@ def sleep_duration():
         page_kind="tool",
     )
 # 4.2.5 午睡时间
+_META_NAP_TIME = {
+    "title": "午睡时间计算器（午睡多久不容易醒来头昏）- CalmyHealth",
+    "description": "输入现在时间或目标起床时间，计算短午睡和完整周期午睡的推荐时间点，帮助减少午睡后头昏、睡懵和睡过头。",
+    "canonical": _CANON["/nap-time"],
+}
+
 @app.route("/nap-time", methods=["GET", "POST"])
 def nap_time():
     error = None
@@ -4383,23 +4695,17 @@ def nap_time():
     result = None
 
     if request.method == "POST":
-        mode_in = request.form.get("mode", "nap_now").strip()
-        time_in = request.form.get("time_hm", "13:30").strip()
+        mode_in = _clean(request.form, "mode", "nap_now")
+        time_in = _clean(request.form, "time_hm", "13:30")
 
         try:
             result = nap_time_info(mode_in, time_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "午睡时间计算器（午睡多久不容易醒来头昏）- CalmyHealth",
-        "description": "输入现在时间或目标起床时间，计算短午睡和完整周期午睡的推荐时间点，帮助减少午睡后头昏、睡懵和睡过头。",
-        "canonical": canonical_url("/nap-time"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "nap_time.html",
-        meta=meta,
+        meta=_META_NAP_TIME,
         error=error,
         mode_in=mode_in,
         time_in=time_in,
@@ -4408,6 +4714,12 @@ def nap_time():
     )
 # ========= 4.3. 睡眠质量 ======= 
 # 4.3.4 时差恢复
+_META_JET_LAG = {
+    "title": "时差恢复计算器（跨时区后大概要几天恢复作息）- CalmyHealth",
+    "description": "输入跨越的时区数量和飞行方向，估算时差恢复所需天数，并了解向东飞、向西飞对睡眠节律的不同影响。",
+    "canonical": _CANON["/jet-lag"],
+}
+
 @app.route("/jet-lag", methods=["GET", "POST"])
 def jet_lag():
     error = None
@@ -4416,24 +4728,18 @@ def jet_lag():
     result = None
 
     if request.method == "POST":
-        zones_in = request.form.get("timezones_crossed", "6").strip()
-        direction_in = request.form.get("direction", "east").strip()
+        zones_in = _clean(request.form, "timezones_crossed", "6")
+        direction_in = _clean(request.form, "direction", "east")
 
         try:
-            timezones_crossed = int(zones_in)
+            timezones_crossed = parse_int(zones_in)
             result = jet_lag_info(timezones_crossed, direction_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "时差恢复计算器（跨时区后大概要几天恢复作息）- CalmyHealth",
-        "description": "输入跨越的时区数量和飞行方向，估算时差恢复所需天数，并了解向东飞、向西飞对睡眠节律的不同影响。",
-        "canonical": canonical_url("/jet-lag"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "jet_lag.html",
-        meta=meta,
+        meta=_META_JET_LAG,
         error=error,
         zones_in=zones_in,
         direction_in=direction_in,
@@ -4441,6 +4747,12 @@ def jet_lag():
         page_kind="tool",
     )
 # 4.3.5 作息类型
+_META_CHRONOTYPE = {
+    "title": "作息类型测试（你是早鸟型还是夜猫型）- CalmyHealth",
+    "description": "通过几个简单问题测试你更像早鸟型、夜猫型还是中间型作息，并查看更适合自己的睡眠节律建议。",
+    "canonical": _CANON["/chronotype"],
+}
+
 @app.route("/chronotype", methods=["GET", "POST"])
 def chronotype():
     error = None
@@ -4455,11 +4767,11 @@ def chronotype():
 
     if request.method == "POST":
         try:
-            answers["sleepy_time"] = request.form.get("sleepy_time", "2").strip()
-            answers["wake_without_alarm"] = request.form.get("wake_without_alarm", "2").strip()
-            answers["best_focus"] = request.form.get("best_focus", "2").strip()
-            answers["weekend_shift"] = request.form.get("weekend_shift", "2").strip()
-            answers["morning_feeling"] = request.form.get("morning_feeling", "2").strip()
+            answers["sleepy_time"] = _clean(request.form, "sleepy_time", "2")
+            answers["wake_without_alarm"] = _clean(request.form, "wake_without_alarm", "2")
+            answers["best_focus"] = _clean(request.form, "best_focus", "2")
+            answers["weekend_shift"] = _clean(request.form, "weekend_shift", "2")
+            answers["morning_feeling"] = _clean(request.form, "morning_feeling", "2")
 
             score = sum(int(v) for v in answers.values())
             result = chronotype_result(score)
@@ -4468,15 +4780,9 @@ def chronotype():
         except Exception:
             error = "请完成所有选项后再提交。"
 
-    meta = {
-        "title": "作息类型测试（你是早鸟型还是夜猫型）- CalmyHealth",
-        "description": "通过几个简单问题测试你更像早鸟型、夜猫型还是中间型作息，并查看更适合自己的睡眠节律建议。",
-        "canonical": canonical_url("/chronotype"),
-    }
-
     return render_template(
         "chronotype.html",
-        meta=meta,
+        meta=_META_CHRONOTYPE,
         error=error,
         result=result,
         answers=answers,
@@ -4486,55 +4792,64 @@ def chronotype():
 # Tool: Body Fat
 # -----------------------
 
+_META_BODYFAT = meta_for(
+    "体脂率计算（US Navy）- CalmyHealth",
+    "体脂率计算器：使用 US Navy 围度公式估算体脂率（%），输入身高、颈围、腰围（女性含臀围），并提供解读与下一步建议。",
+    "/bodyfat",
+)
+
+_BODYFAT_GET_CTX = {
+    "meta": _META_BODYFAT,
+    "error": None,
+    "bf": None,
+    "sex_in": "male",
+    "height_cm_in": "",
+    "neck_cm_in": "",
+    "waist_cm_in": "",
+    "hip_cm_in": "",
+}
+
 @app.route("/bodyfat", methods=["GET", "POST"])
 def bodyfat():
+    if request.method != "POST":
+        return render_template("bodyfat.html", **_BODYFAT_GET_CTX)
+
     error = None
     bf = None
-    sex_in = "male"
-    height_cm_in = ""
-    neck_cm_in = ""
-    waist_cm_in = ""
-    hip_cm_in = ""
 
-    if request.method == "POST":
-        sex_in = request.form.get("sex", "male")
-        height_cm_in = request.form.get("height_cm", "")
-        neck_cm_in = request.form.get("neck_cm", "")
-        waist_cm_in = request.form.get("waist_cm", "")
-        hip_cm_in = request.form.get("hip_cm", "")
+    sex_in = request.form.get("sex", "male")
+    height_cm_in = request.form.get("height_cm", "")
+    neck_cm_in = request.form.get("neck_cm", "")
+    waist_cm_in = request.form.get("waist_cm", "")
+    hip_cm_in = request.form.get("hip_cm", "")
 
-        h = to_float(height_cm_in)
-        n = to_float(neck_cm_in)
-        w = to_float(waist_cm_in)
-        hip = to_float(hip_cm_in) if hip_cm_in.strip() else None
+    h = to_float(height_cm_in)
+    n = to_float(neck_cm_in)
+    w = to_float(waist_cm_in)
+    hip = to_float(hip_cm_in) if hip_cm_in.strip() else None
 
-        try:
-            if sex_in not in ("male", "female"):
-                raise ValueError("性别选择不正确。")
-            if not h or h <= 0:
-                raise ValueError("请输入正确身高。")
-            if not n or n <= 0:
-                raise ValueError("请输入正确颈围。")
-            if not w or w <= 0:
-                raise ValueError("请输入正确腰围。")
-            if sex_in == "female" and (hip is None or hip <= 0):
-                raise ValueError("女性请输入正确臀围。")
-            if w - n <= 0:
-                raise ValueError("腰围需大于颈围（用于公式计算）。")
-
-            bf_val = bodyfat_us_navy(sex_in, h, n, w, hip)
-            bf = round1(clamp(bf_val, 2.0, 60.0))
-        except Exception as e:
-            error = str(e)
+    try:
+        if sex_in not in ("male", "female"):
+            raise ValueError("性别选择不正确。")
+        if not _in_range(h, 0, inf):
+            raise ValueError("请输入正确身高。")
+        if not _in_range(n, 0, inf):
+            raise ValueError("请输入正确颈围。")
+        if not _in_range(w, 0, inf):
+            raise ValueError("请输入正确腰围。")
+        if sex_in == "female" and not _in_range(hip, 0, inf):
+            raise ValueError("女性请输入正确臀围。")
+        if w - n <= 0:
+            raise ValueError("腰围需大于颈围（用于公式计算）。")
+
+        bf_val = bodyfat_us_navy(sex_in, h, n, w, hip)
+        bf = round1(clamp(bf_val, 2.0, 60.0))
+    except Exception as e:
+        error = str(e)
 
-    meta = meta_for(
-        "体脂率计算（US Navy）- CalmyHealth",
-        "体脂率计算器：使用 US Navy 围度公式估算体脂率（%），输入身高、颈围、腰围（女性含臀围），并提供解读与下一步建议。",
-        "/bodyfat",
-    )
     return render_template(
         "bodyfat.html",
-        meta=meta,
+        meta=_META_BODYFAT,
         error=error,
         bf=bf,
         sex_in=sex_in,
@@ -4544,6 +4859,12 @@ def bodyfat():
         hip_cm_in=hip_cm_in,
     )
 
+_META_SLEEP_NEED = {
+    "title": "睡眠需求计算器（按年龄需要睡多久）- CalmyHealth",
+    "description": "输入年龄，查看常见建议睡眠时长范围，并了解不同年龄阶段为什么需要不同睡眠时间。",
+    "canonical": _CANON["/sleep-need"],
+}
+
 @app.route("/sleep-need", methods=["GET", "POST"])
 def sleep_need():
     error = None
@@ -4551,29 +4872,29 @@ def sleep_need():
     result = None
 
     if request.method == "POST":
-        age_in = request.form.get("age", "30").strip()
+        age_in = _clean(request.form, "age", "30")
 
         try:
-            age = int(age_in)
+            age = parse_int(age_in)
             result = sleep_need_by_age(age)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效年龄。"
-
-    meta = {
-        "title": "睡眠需求计算器（按年龄需要睡多久）- CalmyHealth",
-        "description": "输入年龄，查看常见建议睡眠时长范围，并了解不同年龄阶段为什么需要不同睡眠时间。",
-        "canonical": canonical_url("/sleep-need"),
-    }
+            error = str(e) or "请输入有效年龄。"
 
     return render_template(
         "sleep_need.html",
-        meta=meta,
+        meta=_META_SLEEP_NEED,
         error=error,
         age_in=age_in,
         result=result,
         page_kind="tool",
     )
 
+_META_CAFFEINE_CUTOFF = {
+    "title": "咖啡因截止时间计算器（今晚想睡好，最晚几点别再喝咖啡）- CalmyHealth",
+    "description": "输入今晚预计睡觉时间，估算最晚几点后尽量不要再摄入咖啡因，帮助减少咖啡、茶、能量饮料对睡眠的影响。",
+    "canonical": _CANON["/caffeine-cutoff"],
+}
+
 @app.route("/caffeine-cutoff", methods=["GET", "POST"])
 def caffeine_cutoff():
     error = None
@@ -4582,24 +4903,18 @@ def caffeine_cutoff():
     result = None
 
     if request.method == "POST":
-        sleep_in = request.form.get("sleep_hm", "23:00").strip()
-        cutoff_in = request.form.get("cutoff_hours", "6").strip()
+        sleep_in = _clean(request.form, "sleep_hm", "23:00")
+        cutoff_in = _clean(request.form, "cutoff_hours", "6")
 
         try:
-            cutoff_hours = float(cutoff_in)
+            cutoff_hours = parse_float(cutoff_in)
             result = caffeine_cutoff_info(sleep_in, cutoff_hours)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "咖啡因截止时间计算器（今晚想睡好，最晚几点别再喝咖啡）- CalmyHealth",
-        "description": "输入今晚预计睡觉时间，估算最晚几点后尽量不要再摄入咖啡因，帮助减少咖啡、茶、能量饮料对睡眠的影响。",
-        "canonical": canonical_url("/caffeine-cutoff"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "caffeine_cutoff.html",
-        meta=meta,
+        meta=_META_CAFFEINE_CUTOFF,
         error=error,
         sleep_in=sleep_in,
         cutoff_in=cutoff_in,
@@ -4610,40 +4925,55 @@ def caffeine_cutoff():
 # -----------------------
 # Tool: Ideal Weight
 # -----------------------
+_META_IDEAL_WEIGHT = meta_for(
+    "理想体重计算 - CalmyHealth",
+    "理想体重计算器：根据身高与性别，用 Devine/Robinson/Miller/Hamwi 等公式给出多个估算结果并对比参考。",
+    "/ideal-weight",
+)
+
+_IDEAL_WEIGHT_GET_CTX = {
+    "meta": _META_IDEAL_WEIGHT,
+    "error": None,
+    "sex_in": "male",
+    "height_cm_in": "",
+    "results": None,
+}
+
 @app.route("/ideal-weight", methods=["GET", "POST"])
 def ideal_weight():
+    if request.method != "POST":
+        return render_template("ideal_weight.html", **_IDEAL_WEIGHT_GET_CTX)
+
     error = None
-    sex_in = "male"
-    height_cm_in = ""
     results = None
 
-    if request.method == "POST":
-        sex_in = request.form.get("sex", "male")
-        height_cm_in = request.form.get("height_cm", "")
-        h = to_float(height_cm_in)
+    sex_in = request.form.get("sex", "male")
+    height_cm_in = request.form.get("height_cm", "")
+    h = to_float(height_cm_in)
 
-        if sex_in not in ("male", "female"):
-            error = "性别选择不正确。"
-        elif not h or h <= 0 or h > 250:
-            error = "请输入正确身高（cm）。"
-        else:
-            res = ideal_weight_methods(h, sex_in)
-            results = {k: round1(v) for k, v in res.items()}
+    if sex_in not in ("male", "female"):
+        error = "性别选择不正确。"
+    elif not _in_range(h, 0, 250):
+        error = "请输入正确身高（cm）。"
+    else:
+        res = ideal_weight_methods(h, sex_in)
+        results = {k: round1(v) for k, v in res.items()}
 
-    meta = meta_for(
-        "理想体重计算 - CalmyHealth",
-        "理想体重计算器：根据身高与性别，用 Devine/Robinson/Miller/Hamwi 等公式给出多个估算结果并对比参考。",
-        "/ideal-weight",
-    )
     return render_template(
         "ideal_weight.html",
-        meta=meta,
+        meta=_META_IDEAL_WEIGHT,
         error=error,
         sex_in=sex_in,
         height_cm_in=height_cm_in,
         results=results,
     )
 
+_META_SLEEP_EFFICIENCY = {
+    "title": "睡眠效率计算器（你躺床的时间有多少真正睡着了）- CalmyHealth",
+    "description": "输入上床时间、起床时间、入睡耗时和夜间清醒时长，计算睡眠效率，帮助判断你躺床时间中有多少真正用于睡眠。",
+    "canonical": _CANON["/sleep-efficiency"],
+}
+
 @app.route("/sleep-efficiency", methods=["GET", "POST"])
 def sleep_efficiency():
     error = None
@@ -4654,14 +4984,14 @@ def sleep_efficiency():
     result = None
 
     if request.method == "POST":
-        bed_in = request.form.get("bed_hm", "23:00").strip()
-        wake_in = request.form.get("wake_hm", "07:00").strip()
-        latency_in = request.form.get("sleep_latency_min", "20").strip()
-        awake_in = request.form.get("awake_during_night_min", "30").strip()
+        bed_in = _clean(request.form, "bed_hm", "23:00")
+        wake_in = _clean(request.form, "wake_hm", "07:00")
+        latency_in = _clean(request.form, "sleep_latency_min", "20")
+        awake_in = _clean(request.form, "awake_during_night_min", "30")
 
         try:
-            sleep_latency_min = int(latency_in)
-            awake_during_night_min = int(awake_in)
+            sleep_latency_min = parse_int(latency_in)
+            awake_during_night_min = parse_int(awake_in)
 
             result = sleep_efficiency_info(
                 bed_in,
@@ -4671,17 +5001,11 @@ def sleep_efficiency():
             )
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "睡眠效率计算器（你躺床的时间有多少真正睡着了）- CalmyHealth",
-        "description": "输入上床时间、起床时间、入睡耗时和夜间清醒时长，计算睡眠效率，帮助判断你躺床时间中有多少真正用于睡眠。",
-        "canonical": canonical_url("/sleep-efficiency"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "sleep_efficiency.html",
-        meta=meta,
+        meta=_META_SLEEP_EFFICIENCY,
         error=error,
         bed_in=bed_in,
         wake_in=wake_in,
@@ -4696,36 +5020,46 @@ def sleep_efficiency():
 # Tool: Waist Risk
 # -----------------------
 # 1.2.2 腰围风险
+_META_WAIST = meta_for(
+    "腰围风险（WHtR）- CalmyHealth",
+    "腰围风险评估：通过腰围/身高比（WHtR）给出简单风险提示，并提供建议与相关工具推荐。",
+    "/waist",
+)
+
+_WAIST_GET_CTX = {
+    "meta": _META_WAIST,
+    "error": None,
+    "waist_cm_in": "",
+    "height_cm_in": "",
+    "whtr": None,
+    "level": None,
+}
+
 @app.route("/waist", methods=["GET", "POST"])
 def waist():
+    if request.method != "POST":
+        return render_template("waist.html", **_WAIST_GET_CTX)
+
     error = None
-    wc_in = ""
-    height_cm_in = ""
     whtr = None
     level = None
 
-    if request.method == "POST":
-        wc_in = request.form.get("waist_cm", "")
-        height_cm_in = request.form.get("height_cm", "")
-        wc = to_float(wc_in)
-        h = to_float(height_cm_in)
-
-        if not wc or wc <= 0:
-            error = "请输入正确腰围（cm）。"
-        elif not h or h <= 0:
-            error = "请输入正确身高（cm）。"
-        else:
-            whtr, level = waist_risk(wc, h)
-            whtr = round1(whtr)
+    wc_in = request.form.get("waist_cm", "")
+    height_cm_in = request.form.get("height_cm", "")
+    wc = to_float(wc_in)
+    h = to_float(height_cm_in)
+
+    if not _in_range(wc, 0, inf):
+        error = "请输入正确腰围（cm）。"
+    elif not _in_range(h, 0, inf):
+        error = "请输入正确身高（cm）。"
+    else:
+        whtr, level = waist_risk(wc, h)
+        whtr = round1(whtr)
 
-    meta = meta_for(
-        "腰围风险（WHtR）- CalmyHealth",
-        "腰围风险评估：通过腰围/身高比（WHtR）给出简单风险提示，并提供建议与相关工具推荐。",
-        "/waist",
-    )
     return render_template(
         "waist.html",
-        meta=meta,
+        meta=_META_WAIST,
         error=error,
         waist_cm_in=wc_in,
         height_cm_in=height_cm_in,
@@ -4734,6 +5068,12 @@ def waist():
     )
 
 # 1.2.3. 腰臀比
+_META_WHR = {
+    "title": "腰臀比计算器（WHR）- CalmyHealth",
+    "description": "输入腰围、臀围和性别，计算腰臀比（WHR），查看常见参考范围，并帮助理解腰部脂肪分布风险。",
+    "canonical": _CANON["/whr"],
+}
+
 @app.route("/whr", methods=["GET", "POST"])
 def whr():
     error = None
@@ -4743,26 +5083,20 @@ def whr():
     result = None
 
     if request.method == "POST":
-        sex_in = request.form.get("sex", "male").strip()
-        waist_cm_in = request.form.get("waist_cm", "").strip()
-        hip_cm_in = request.form.get("hip_cm", "").strip()
+        sex_in = _clean(request.form, "sex", "male")
+        waist_cm_in = _clean(request.form, "waist_cm")
+        hip_cm_in = _clean(request.form, "hip_cm")
 
         try:
-            waist_cm = float(waist_cm_in)
-            hip_cm = float(hip_cm_in)
+            waist_cm = parse_float(waist_cm_in)
+            hip_cm = parse_float(hip_cm_in)
             result = whr_info(waist_cm, hip_cm, sex_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "腰臀比计算器（WHR）- CalmyHealth",
-        "description": "输入腰围、臀围和性别，计算腰臀比（WHR），查看常见参考范围，并帮助理解腰部脂肪分布风险。",
-        "canonical": canonical_url("/whr"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "whr.html",
-        meta=meta,
+        meta=_META_WHR,
         error=error,
         sex_in=sex_in,
         waist_cm_in=waist_cm_in,
@@ -4771,6 +5105,12 @@ def whr():
         page_kind="tool",
     )
 # 1.2.4 FFMI 计算
+_META_FFMI = {
+    "title": "FFMI 计算器（去脂体重指数）- CalmyHealth",
+    "description": "输入身高、体重、体脂率和性别，计算 FFMI（去脂体重指数）、标准化 FFMI 和去脂体重，帮助更全面理解体型与肌肉量水平。",
+    "canonical": _CANON["/ffmi"],
+}
+
 @app.route("/ffmi", methods=["GET", "POST"])
 def ffmi():
     error = None
@@ -4781,30 +5121,24 @@ def ffmi():
     result = None
 
     if request.method == "POST":
-        sex_in = request.form.get("sex", "male").strip()
-        height_cm_in = request.form.get("height_cm", "").strip()
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        bodyfat_pct_in = request.form.get("bodyfat_pct", "").strip()
+        sex_in = _clean(request.form, "sex", "male")
+        height_cm_in = _clean(request.form, "height_cm")
+        weight_kg_in = _clean(request.form, "weight_kg")
+        bodyfat_pct_in = _clean(request.form, "bodyfat_pct")
 
         try:
-            height_cm = float(height_cm_in)
-            weight_kg = float(weight_kg_in)
-            bodyfat_pct = float(bodyfat_pct_in)
+            height_cm = parse_float(height_cm_in)
+            weight_kg = parse_float(weight_kg_in)
+            bodyfat_pct = parse_float(bodyfat_pct_in)
 
             result = ffmi_info(height_cm, weight_kg, bodyfat_pct, sex_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "FFMI 计算器（去脂体重指数）- CalmyHealth",
-        "description": "输入身高、体重、体脂率和性别，计算 FFMI（去脂体重指数）、标准化 FFMI 和去脂体重，帮助更全面理解体型与肌肉量水平。",
-        "canonical": canonical_url("/ffmi"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "ffmi.html",
-        meta=meta,
+        meta=_META_FFMI,
         error=error,
         sex_in=sex_in,
         height_cm_in=height_cm_in,
@@ -4814,6 +5148,12 @@ def ffmi():
         page_kind="tool",
     )
 # 1.2.5 体脂目标时间
+_META_BODY_FAT_GOAL = {
+    "title": "体脂目标时间计算器（多久能降到目标体脂）- CalmyHealth",
+    "description": "输入当前体重、当前体脂率、目标体脂率和每日热量缺口，估算达到目标体脂率大概需要多久，并查看减脂节奏参考。",
+    "canonical": _CANON["/body-fat-goal"],
+}
+
 @app.route("/body-fat-goal", methods=["GET", "POST"])
 def body_fat_goal():
     error = None
@@ -4824,16 +5164,16 @@ def body_fat_goal():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        bodyfat_pct_in = request.form.get("bodyfat_pct", "").strip()
-        target_bodyfat_pct_in = request.form.get("target_bodyfat_pct", "").strip()
-        daily_deficit_kcal_in = request.form.get("daily_deficit_kcal", "400").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
+        bodyfat_pct_in = _clean(request.form, "bodyfat_pct")
+        target_bodyfat_pct_in = _clean(request.form, "target_bodyfat_pct")
+        daily_deficit_kcal_in = _clean(request.form, "daily_deficit_kcal", "400")
 
         try:
-            weight_kg = float(weight_kg_in)
-            bodyfat_pct = float(bodyfat_pct_in)
-            target_bodyfat_pct = float(target_bodyfat_pct_in)
-            daily_deficit_kcal = float(daily_deficit_kcal_in)
+            weight_kg = parse_float(weight_kg_in)
+            bodyfat_pct = parse_float(bodyfat_pct_in)
+            target_bodyfat_pct = parse_float(target_bodyfat_pct_in)
+            daily_deficit_kcal = parse_float(daily_deficit_kcal_in)
 
             result = body_fat_goal_info(
                 weight_kg,
@@ -4843,17 +5183,11 @@ def body_fat_goal():
             )
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "体脂目标时间计算器（多久能降到目标体脂）- CalmyHealth",
-        "description": "输入当前体重、当前体脂率、目标体脂率和每日热量缺口，估算达到目标体脂率大概需要多久，并查看减脂节奏参考。",
-        "canonical": canonical_url("/body-fat-goal"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "body_fat_goal.html",
-        meta=meta,
+        meta=_META_BODY_FAT_GOAL,
         error=error,
         weight_kg_in=weight_kg_in,
         bodyfat_pct_in=bodyfat_pct_in,
@@ -4867,35 +5201,45 @@ def body_fat_goal():
 # -----------------------
 # ========= 3.1. 日常摄入 ======= 
 # 3.1.2. 蛋白质
+_META_PROTEIN = meta_for(
+    "蛋白质需求计算 - CalmyHealth",
+    "蛋白质需求计算器：按体重与目标（维持/减脂/增肌）给出每日蛋白质摄入建议（g/天），并提供实践建议。",
+    "/protein",
+)
+
+_PROTEIN_GET_CTX = {
+    "meta": _META_PROTEIN,
+    "error": None,
+    "weight_kg_in": "",
+    "goal_in": "maintain",
+    "grams": None,
+    "label": None,
+}
+
 @app.route("/protein", methods=["GET", "POST"])
 def protein():
+    if request.method != "POST":
+        return render_template("protein.html", **_PROTEIN_GET_CTX)
+
     error = None
-    weight_kg_in = ""
-    goal_in = "maintain"
     grams = None
     label = None
 
-    if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "")
-        goal_in = request.form.get("goal", "maintain")
-        w = to_float(weight_kg_in)
-
-        if not w or w <= 0 or w > 300:
-            error = "请输入正确体重（kg）。"
-        elif goal_in not in ("maintain", "fat_loss", "muscle_gain"):
-            error = "目标选择不正确。"
-        else:
-            g, label = protein_grams(w, goal_in)
-            grams = round0(g)
+    weight_kg_in = request.form.get("weight_kg", "")
+    goal_in = request.form.get("goal", "maintain")
+    w = to_float(weight_kg_in)
+
+    if not _in_range(w, 0, 300):
+        error = "请输入正确体重（kg）。"
+    elif goal_in not in ("maintain", "fat_loss", "muscle_gain"):
+        error = "目标选择不正确。"
+    else:
+        g, label = protein_grams(w, goal_in)
+        grams = round0(g)
 
-    meta = meta_for(
-        "蛋白质需求计算 - CalmyHealth",
-        "蛋白质需求计算器：按体重与目标（维持/减脂/增肌）给出每日蛋白质摄入建议（g/天），并提供实践建议。",
-        "/protein",
-    )
     return render_template(
         "protein.html",
-        meta=meta,
+        meta=_META_PROTEIN,
         error=error,
         weight_kg_in=weight_kg_in,
         goal_in=goal_in,
@@ -4905,6 +5249,12 @@ def protein():
 
 # ======= 3.2. 宏量营养 ============
 # 3.2.1. 宏量营养
+_META_MACRO = {
+    "title": "宏量营养素计算器（蛋白质、碳水、脂肪每天该吃多少）- CalmyHealth",
+    "description": "输入每日总热量并选择目标，计算蛋白质、碳水和脂肪的建议分配，适合减脂、维持和增肌人群参考。",
+    "canonical": _CANON["/macro"],
+}
+
 @app.route("/macro", methods=["GET", "POST"])
 def macro():
     error = None
@@ -4913,28 +5263,22 @@ def macro():
     result = None
 
     if request.method == "POST":
-        tdee_in = request.form.get("tdee", "").strip()
-        goal_in = request.form.get("goal", "maintain").strip()
+        tdee_in = _clean(request.form, "tdee")
+        goal_in = _clean(request.form, "goal", "maintain")
 
         try:
-            tdee_val = float(tdee_in)
+            tdee_val = parse_float(tdee_in)
             if goal_in not in ("fat_loss", "maintain", "muscle_gain"):
                 raise ValueError("目标选择不正确。")
 
             result = macro_split(tdee_val, goal_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "宏量营养素计算器（蛋白质、碳水、脂肪每天该吃多少）- CalmyHealth",
-        "description": "输入每日总热量并选择目标，计算蛋白质、碳水和脂肪的建议分配，适合减脂、维持和增肌人群参考。",
-        "canonical": canonical_url("/macro"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "macro.html",
-        meta=meta,
+        meta=_META_MACRO,
         error=error,
         tdee_in=tdee_in,
         goal_in=goal_in,
@@ -4943,6 +5287,12 @@ def macro():
     )
 # ========= 3.3 饮食分配 ======= 
 # 3.3.1. 餐次分配
+_META_MEAL_SPLIT = {
+    "title": "餐次分配计算器（一天三餐怎么分配热量和蛋白质）- CalmyHealth",
+    "description": "输入每日总热量和蛋白质目标，把一天三餐的热量与蛋白质分配得更清楚，适合减脂、维持和增肌饮食安排参考。",
+    "canonical": _CANON["/meal-split"],
+}
+
 @app.route("/meal-split", methods=["GET", "POST"])
 def meal_split():
     error = None
@@ -4952,13 +5302,13 @@ def meal_split():
     result = None
 
     if request.method == "POST":
-        kcal_in = request.form.get("kcal", "").strip()
-        protein_in = request.form.get("protein_g", "").strip()
-        pattern_in = request.form.get("pattern", "balanced").strip()
+        kcal_in = _clean(request.form, "kcal")
+        protein_in = _clean(request.form, "protein_g")
+        pattern_in = _clean(request.form, "pattern", "balanced")
 
         try:
-            kcal_val = float(kcal_in)
-            protein_val = float(protein_in)
+            kcal_val = parse_float(kcal_in)
+            protein_val = parse_float(protein_in)
 
             if pattern_in not in ("balanced", "light_dinner", "big_dinner"):
                 raise ValueError("分配模式不正确。")
@@ -4966,17 +5316,11 @@ def meal_split():
             result = meal_split_plan(kcal_val, protein_val, pattern_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "餐次分配计算器（一天三餐怎么分配热量和蛋白质）- CalmyHealth",
-        "description": "输入每日总热量和蛋白质目标，把一天三餐的热量与蛋白质分配得更清楚，适合减脂、维持和增肌饮食安排参考。",
-        "canonical": canonical_url("/meal-split"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "meal_split.html",
-        meta=meta,
+        meta=_META_MEAL_SPLIT,
         error=error,
         kcal_in=kcal_in,
         protein_in=protein_in,
@@ -4986,6 +5330,12 @@ def meal_split():
     )
 # ========= 3.4 饮食质量 ======= 
 ## 3.4.1. GL估算 
+_META_GLYCEMIC_LOAD = {
+    "title": "GI/GL 估算器（血糖负荷计算器）- CalmyHealth",
+    "description": "输入 GI、总碳水和膳食纤维，估算食物的血糖负荷 GL，并了解低 GI、低 GL 与饮食结构之间的区别。",
+    "canonical": _CANON["/glycemic-load"],
+}
+
 @app.route("/glycemic-load", methods=["GET", "POST"])
 def glycemic_load():
     error = None
@@ -4996,29 +5346,23 @@ def glycemic_load():
     fiber_in = "0"
 
     if request.method == "POST":
-        gi_in = request.form.get("gi", "").strip()
-        carbs_in = request.form.get("carbs_g", "").strip()
-        fiber_in = request.form.get("fiber_g", "0").strip()
+        gi_in = _clean(request.form, "gi")
+        carbs_in = _clean(request.form, "carbs_g")
+        fiber_in = _clean(request.form, "fiber_g", "0")
 
         try:
-            gi_val = float(gi_in)
-            carbs_val = float(carbs_in)
-            fiber_val = float(fiber_in)
+            gi_val = parse_float(gi_in)
+            carbs_val = parse_float(carbs_in)
+            fiber_val = parse_float(fiber_in)
 
             result = glycemic_load_info(gi_val, carbs_val, fiber_val)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "GI/GL 估算器（血糖负荷计算器）- CalmyHealth",
-        "description": "输入 GI、总碳水和膳食纤维，估算食物的血糖负荷 GL，并了解低 GI、低 GL 与饮食结构之间的区别。",
-        "canonical": canonical_url("/glycemic-load"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "glycemic_load.html",
-        meta=meta,
+        meta=_META_GLYCEMIC_LOAD,
         error=error,
         result=result,
         gi_in=gi_in,
@@ -5027,6 +5371,12 @@ def glycemic_load():
         page_kind="tool",
     )
 # 3.1.3. 碳水 (Route)
+_META_CARBS = {
+    "title": "碳水化合物需求计算器（每天大概要吃多少碳水）- CalmyHealth",
+    "description": "输入体重并选择目标，估算每天建议摄入多少碳水化合物，适合减脂、维持和增肌饮食参考。",
+    "canonical": _CANON["/carbs"],
+}
+
 @app.route("/carbs", methods=["GET", "POST"])
 def carbs():
     error = None
@@ -5035,28 +5385,22 @@ def carbs():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        goal_in = request.form.get("goal", "maintain").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
+        goal_in = _clean(request.form, "goal", "maintain")
 
         try:
-            weight_kg = float(weight_kg_in)
+            weight_kg = parse_float(weight_kg_in)
             if goal_in not in ("fat_loss", "maintain", "muscle_gain"):
                 raise ValueError("目标选择不正确。")
 
             result = carbs_need(weight_kg, goal_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "碳水化合物需求计算器（每天大概要吃多少碳水）- CalmyHealth",
-        "description": "输入体重并选择目标，估算每天建议摄入多少碳水化合物，适合减脂、维持和增肌饮食参考。",
-        "canonical": canonical_url("/carbs"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "carbs.html",
-        meta=meta,
+        meta=_META_CARBS,
         error=error,
         weight_kg_in=weight_kg_in,
         goal_in=goal_in,
@@ -5065,6 +5409,12 @@ def carbs():
     )
 
 # 3.1.4. 脂肪摄入 (Route)
+_META_FAT_INTAKE = {
+    "title": "脂肪摄入计算器（每天建议吃多少脂肪）- CalmyHealth",
+    "description": "输入体重并选择目标，估算每天建议摄入多少脂肪，适合作为减脂、维持和增肌饮食的参考起点。",
+    "canonical": _CANON["/fat-intake"],
+}
+
 @app.route("/fat-intake", methods=["GET", "POST"])
 def fat_intake():
     error = None
@@ -5073,28 +5423,22 @@ def fat_intake():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        goal_in = request.form.get("goal", "maintain").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
+        goal_in = _clean(request.form, "goal", "maintain")
 
         try:
-            weight_kg = float(weight_kg_in)
+            weight_kg = parse_float(weight_kg_in)
             if goal_in not in ("fat_loss", "maintain", "muscle_gain"):
                 raise ValueError("目标选择不正确。")
 
             result = fat_need(weight_kg, goal_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "脂肪摄入计算器（每天建议吃多少脂肪）- CalmyHealth",
-        "description": "输入体重并选择目标，估算每天建议摄入多少脂肪，适合作为减脂、维持和增肌饮食的参考起点。",
-        "canonical": canonical_url("/fat-intake"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "fat_intake.html",
-        meta=meta,
+        meta=_META_FAT_INTAKE,
         error=error,
         weight_kg_in=weight_kg_in,
         goal_in=goal_in,
@@ -5102,6 +5446,12 @@ def fat_intake():
         page_kind="tool",
     )
 # 3.1.5. 膳食纤维 (Route)
+_META_FIBER = {
+    "title": "膳食纤维计算器（每天需要多少纤维）- CalmyHealth",
+    "description": "输入每日热量和性别，估算每天建议摄入多少膳食纤维，并了解膳食纤维在日常饮食中的作用。",
+    "canonical": _CANON["/fiber"],
+}
+
 @app.route("/fiber", methods=["GET", "POST"])
 def fiber():
     error = None
@@ -5110,24 +5460,18 @@ def fiber():
     result = None
 
     if request.method == "POST":
-        kcal_in = request.form.get("kcal", "").strip()
-        sex_in = request.form.get("sex", "male").strip()
+        kcal_in = _clean(request.form, "kcal")
+        sex_in = _clean(request.form, "sex", "male")
 
         try:
-            kcal_val = float(kcal_in)
+            kcal_val = parse_float(kcal_in)
             result = fiber_need(kcal_val, sex_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "膳食纤维计算器（每天需要多少纤维）- CalmyHealth",
-        "description": "输入每日热量和性别，估算每天建议摄入多少膳食纤维，并了解膳食纤维在日常饮食中的作用。",
-        "canonical": canonical_url("/fiber"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "fiber.html",
-        meta=meta,
+        meta=_META_FIBER,
         error=error,
         kcal_in=kcal_in,
         sex_in=sex_in,
@@ -5136,6 +5480,12 @@ def fiber():
     )
 
 # 3.1.6. 盐摄入 (Route)
+_META_SALT = {
+    "title": "盐摄入估算器（你每天吃盐会不会太多）- CalmyHealth",
+    "description": "根据家常菜、外卖、汤、加工食品和咸味零食的份数，粗略估算每天盐摄入是否偏高，并给出日常调整建议。",
+    "canonical": _CANON["/salt"],
+}
+
 @app.route("/salt", methods=["GET", "POST"])
 def salt():
     error = None
@@ -5147,32 +5497,26 @@ def salt():
     result = None
 
     if request.method == "POST":
-        home_in = request.form.get("home_meals", "2").strip()
-        takeout_in = request.form.get("takeout_meals", "1").strip()
-        soup_in = request.form.get("soup_bowls", "0").strip()
-        processed_in = request.form.get("processed_servings", "1").strip()
-        snack_in = request.form.get("snack_servings", "0").strip()
+        home_in = _clean(request.form, "home_meals", "2")
+        takeout_in = _clean(request.form, "takeout_meals", "1")
+        soup_in = _clean(request.form, "soup_bowls", "0")
+        processed_in = _clean(request.form, "processed_servings", "1")
+        snack_in = _clean(request.form, "snack_servings", "0")
 
         try:
             result = salt_estimate(
-                int(home_in),
-                int(takeout_in),
-                int(soup_in),
-                int(processed_in),
-                int(snack_in),
+                parse_int(home_in),
+                parse_int(takeout_in),
+                parse_int(soup_in),
+                parse_int(processed_in),
+                parse_int(snack_in),
             )
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "盐摄入估算器（你每天吃盐会不会太多）- CalmyHealth",
-        "description": "根据家常菜、外卖、汤、加工食品和咸味零食的份数，粗略估算每天盐摄入是否偏高，并给出日常调整建议。",
-        "canonical": canonical_url("/salt"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "salt.html",
-        meta=meta,
+        meta=_META_SALT,
         error=error,
         home_in=home_in,
         takeout_in=takeout_in,
@@ -5182,64 +5526,13 @@ def salt():
         result=result,
         page_kind="tool",
     )
-# 3.1.7 糖摄入
-def sugar_intake_estimate(
-    sugary_drinks: int,
-    desserts: int,
-    sweet_snacks: int,
-    sweet_sauces: int,
-    sweet_coffee_tea: int,
-) -> dict:
-    """
-    Very simplified daily sugar estimator.
-
-    Estimated sugar per serving (g):
-    - sugary drink: 25 g
-    - dessert: 18 g
-    - sweet snack: 12 g
-    - sweet sauce / syrup use: 8 g
-    - sweetened coffee / tea: 10 g
-
-    Educational estimate only.
-    """
-
-    vals = [sugary_drinks, desserts, sweet_snacks, sweet_sauces, sweet_coffee_tea]
-    if any(v < 0 or v > 20 for v in vals):
-        raise ValueError("请输入合理的份数。")
-
-    total_sugar_g = (
-        sugary_drinks * 25
-        + desserts * 18
-        + sweet_snacks * 12
-        + sweet_sauces * 8
-        + sweet_coffee_tea * 10
-    )
-
-    total_sugar_g = round1(total_sugar_g)
-    total_sugar_kcal = round0(total_sugar_g * 4)
-
-    if total_sugar_g <= 25:
-        level = "较低"
-        note = "整体糖摄入大致偏低或较克制。"
-        progress = 35
-    elif total_sugar_g <= 50:
-        level = "需要注意"
-        note = "已经进入很多人日常容易不知不觉偏高的区间。"
-        progress = 65
-    else:
-        level = "偏高"
-        note = "糖摄入相对偏高，更建议留意饮料、甜点和零食来源。"
-        progress = 88
-
-    return {
-        "total_sugar_g": total_sugar_g,
-        "total_sugar_kcal": total_sugar_kcal,
-        "level": level,
-        "note": note,
-        "progress": progress,
-        "rule_text": "本工具采用站内简化估算模型，根据常见含糖饮料、甜点、零食和调味场景粗略估算每日糖摄入。",
-    }
 # 3.1.8 咖啡因摄入
+_META_CAFFEINE_INTAKE = {
+    "title": "咖啡因摄入计算器（一天喝多少咖啡因）- CalmyHealth",
+    "description": "根据咖啡、浓缩咖啡、茶、能量饮料和可乐的份数，粗略估算每天咖啡因摄入量，并判断整体是否偏高。",
+    "canonical": _CANON["/caffeine-intake"],
+}
+
 @app.route("/caffeine-intake", methods=["GET", "POST"])
 def caffeine_intake():
     error = None
@@ -5252,32 +5545,26 @@ def caffeine_intake():
     cola_cans_in = "0"
 
     if request.method == "POST":
-        brewed_coffee_in = request.form.get("brewed_coffee", "1").strip()
-        espresso_shots_in = request.form.get("espresso_shots", "0").strip()
-        tea_cups_in = request.form.get("tea_cups", "1").strip()
-        energy_drinks_in = request.form.get("energy_drinks", "0").strip()
-        cola_cans_in = request.form.get("cola_cans", "0").strip()
+        brewed_coffee_in = _clean(request.form, "brewed_coffee", "1")
+        espresso_shots_in = _clean(request.form, "espresso_shots", "0")
+        tea_cups_in = _clean(request.form, "tea_cups", "1")
+        energy_drinks_in = _clean(request.form, "energy_drinks", "0")
+        cola_cans_in = _clean(request.form, "cola_cans", "0")
 
         try:
             result = caffeine_intake_estimate(
-                int(brewed_coffee_in),
-                int(espresso_shots_in),
-                int(tea_cups_in),
-                int(energy_drinks_in),
-                int(cola_cans_in),
+                parse_int(brewed_coffee_in),
+                parse_int(espresso_shots_in),
+                parse_int(tea_cups_in),
+                parse_int(energy_drinks_in),
+                parse_int(cola_cans_in),
             )
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "咖啡因摄入计算器（一天喝多少咖啡因）- CalmyHealth",
-        "description": "根据咖啡、浓缩咖啡、茶、能量饮料和可乐的份数，粗略估算每天咖啡因摄入量，并判断整体是否偏高。",
-        "canonical": canonical_url("/caffeine-intake"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "caffeine_intake.html",
-        meta=meta,
+        meta=_META_CAFFEINE_INTAKE,
         error=error,
         result=result,
         brewed_coffee_in=brewed_coffee_in,
@@ -5293,40 +5580,55 @@ def caffeine_intake():
 # 4. 运动与习惯
 # ========= 4.1. 运动消耗 ======= 
 # 4.1.1 步数转热量
+_META_STEPS = meta_for(
+    "步数转热量消耗 - CalmyHealth",
+    "步数转热量计算器：按步数与体重粗略估算步行消耗（kcal），并给出使用建议与相关工具链接。",
+    "/steps",
+)
+
+_STEPS_GET_CTX = {
+    "meta": _META_STEPS,
+    "error": None,
+    "steps_in": "",
+    "weight_kg_in": "",
+    "kcal": None,
+}
+
 @app.route("/steps", methods=["GET", "POST"])
 def steps():
+    if request.method != "POST":
+        return render_template("steps.html", **_STEPS_GET_CTX)
+
     error = None
-    steps_in = ""
-    weight_kg_in = ""
     kcal = None
 
-    if request.method == "POST":
-        steps_in = request.form.get("steps", "")
-        weight_kg_in = request.form.get("weight_kg", "")
-        s = to_int(steps_in)
-        w = to_float(weight_kg_in)
-
-        if s is None or s <= 0 or s > 200000:
-            error = "请输入正确步数。"
-        elif not w or w <= 0 or w > 300:
-            error = "请输入正确体重（kg）。"
-        else:
-            kcal = round0(steps_to_kcal(s, w))
+    steps_in = request.form.get("steps", "")
+    weight_kg_in = request.form.get("weight_kg", "")
+    s = to_int(steps_in)
+    w = to_float(weight_kg_in)
+
+    if not _in_range(s, 0, 200000):
+        error = "请输入正确步数。"
+    elif not _in_range(w, 0, 300):
+        error = "请输入正确体重（kg）。"
+    else:
+        kcal = round0(steps_to_kcal(s, w))
 
-    meta = meta_for(
-        "步数转热量消耗 - CalmyHealth",
-        "步数转热量计算器：按步数与体重粗略估算步行消耗（kcal），并给出使用建议与相关工具链接。",
-        "/steps",
-    )
     return render_template(
         "steps.html",
-        meta=meta,
+        meta=_META_STEPS,
         error=error,
         steps_in=steps_in,
         weight_kg_in=weight_kg_in,
         kcal=kcal,
     )
 # 4.1.2 步数转距离 (Route)
+_META_STEPS_DISTANCE = {
+    "title": "步数转距离计算器（10000步大概是多少公里）- CalmyHealth",
+    "description": "输入步数、身高和性别，估算步数大概等于多少米、多少公里，并了解步数与距离的换算逻辑。",
+    "canonical": _CANON["/steps-distance"],
+}
+
 @app.route("/steps-distance", methods=["GET", "POST"])
 def steps_distance():
     error = None
@@ -5336,26 +5638,20 @@ def steps_distance():
     result = None
 
     if request.method == "POST":
-        steps_in = request.form.get("steps", "10000").strip()
-        height_cm_in = request.form.get("height_cm", "").strip()
-        sex_in = request.form.get("sex", "male").strip()
+        steps_in = _clean(request.form, "steps", "10000")
+        height_cm_in = _clean(request.form, "height_cm")
+        sex_in = _clean(request.form, "sex", "male")
 
         try:
-            steps_val = int(steps_in)
-            height_val = float(height_cm_in)
+            steps_val = parse_int(steps_in)
+            height_val = parse_float(height_cm_in)
             result = steps_to_distance(steps_val, height_val, sex_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "步数转距离计算器（10000步大概是多少公里）- CalmyHealth",
-        "description": "输入步数、身高和性别，估算步数大概等于多少米、多少公里，并了解步数与距离的换算逻辑。",
-        "canonical": canonical_url("/steps-distance"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "steps_distance.html",
-        meta=meta,
+        meta=_META_STEPS_DISTANCE,
         error=error,
         steps_in=steps_in,
         height_cm_in=height_cm_in,
@@ -5364,6 +5660,12 @@ def steps_distance():
         page_kind="tool",
     )
 # 4.1.3 步数转步行时间 (Route)
+_META_STEPS_TIME = {
+    "title": "步数转步行时间计算器（这些步数大概要走多久）- CalmyHealth",
+    "description": "输入步数和步行速度，估算这些步数大概要走多久，帮助你更直观地理解每日步数和活动时间。",
+    "canonical": _CANON["/steps-time"],
+}
+
 @app.route("/steps-time", methods=["GET", "POST"])
 def steps_time():
     error = None
@@ -5372,24 +5674,18 @@ def steps_time():
     result = None
 
     if request.method == "POST":
-        steps_in = request.form.get("steps", "10000").strip()
-        pace_in = request.form.get("pace", "normal").strip()
+        steps_in = _clean(request.form, "steps", "10000")
+        pace_in = _clean(request.form, "pace", "normal")
 
         try:
-            steps_val = int(steps_in)
+            steps_val = parse_int(steps_in)
             result = steps_to_time(steps_val, pace_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "步数转步行时间计算器（这些步数大概要走多久）- CalmyHealth",
-        "description": "输入步数和步行速度，估算这些步数大概要走多久，帮助你更直观地理解每日步数和活动时间。",
-        "canonical": canonical_url("/steps-time"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "steps_time.html",
-        meta=meta,
+        meta=_META_STEPS_TIME,
         error=error,
         steps_in=steps_in,
         pace_in=pace_in,
@@ -5397,6 +5693,12 @@ def steps_time():
         page_kind="tool",
     )
 # 4.1.4 每日步数目标
+_META_STEP_GOAL = {
+    "title": "每日步数目标计算器（想减脂或维持体重，每天走多少步更合适）- CalmyHealth",
+    "description": "输入你当前日均步数和目标，估算每天更适合的步数目标，并帮助你把活动量目标变得更清晰、更容易执行。",
+    "canonical": _CANON["/step-goal"],
+}
+
 @app.route("/step-goal", methods=["GET", "POST"])
 def step_goal():
     error = None
@@ -5405,28 +5707,22 @@ def step_goal():
     result = None
 
     if request.method == "POST":
-        current_steps_in = request.form.get("current_steps", "6000").strip()
-        goal_in = request.form.get("goal", "maintain").strip()
+        current_steps_in = _clean(request.form, "current_steps", "6000")
+        goal_in = _clean(request.form, "goal", "maintain")
 
         try:
-            current_steps_val = int(current_steps_in)
+            current_steps_val = parse_int(current_steps_in)
             if goal_in not in ("maintain", "fat_loss", "active_upgrade"):
                 raise ValueError("目标选择不正确。")
 
             result = step_goal_plan(current_steps_val, goal_in)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "每日步数目标计算器（想减脂或维持体重，每天走多少步更合适）- CalmyHealth",
-        "description": "输入你当前日均步数和目标，估算每天更适合的步数目标，并帮助你把活动量目标变得更清晰、更容易执行。",
-        "canonical": canonical_url("/step-goal"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "step_goal.html",
-        meta=meta,
+        meta=_META_STEP_GOAL,
         error=error,
         current_steps_in=current_steps_in,
         goal_in=goal_in,
@@ -5434,6 +5730,12 @@ def step_goal():
         page_kind="tool",
     )
 # 4.1.5 活动量等级
+_META_ACTIVITY_LEVEL = {
+    "title": "活动量等级计算器（你属于久坐、轻度还是中度活动）- CalmyHealth",
+    "description": "输入日均步数、每周运动天数和久坐时长，估算你的活动量等级，并帮助理解自己更接近久坐、轻度还是中度活动。",
+    "canonical": _CANON["/activity-level"],
+}
+
 @app.route("/activity-level", methods=["GET", "POST"])
 def activity_level():
     error = None
@@ -5443,28 +5745,22 @@ def activity_level():
     result = None
 
     if request.method == "POST":
-        steps_in = request.form.get("steps_per_day", "7000").strip()
-        exercise_days_in = request.form.get("exercise_days", "2").strip()
-        sit_hours_in = request.form.get("sit_hours", "8").strip()
+        steps_in = _clean(request.form, "steps_per_day", "7000")
+        exercise_days_in = _clean(request.form, "exercise_days", "2")
+        sit_hours_in = _clean(request.form, "sit_hours", "8")
 
         try:
             result = activity_level_info(
-                int(steps_in),
-                int(exercise_days_in),
-                float(sit_hours_in),
+                parse_int(steps_in),
+                parse_int(exercise_days_in),
+                parse_float(sit_hours_in),
             )
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "活动量等级计算器（你属于久坐、轻度还是中度活动）- CalmyHealth",
-        "description": "输入日均步数、每周运动天数和久坐时长，估算你的活动量等级，并帮助理解自己更接近久坐、轻度还是中度活动。",
-        "canonical": canonical_url("/activity-level"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "activity_level.html",
-        meta=meta,
+        meta=_META_ACTIVITY_LEVEL,
         error=error,
         steps_in=steps_in,
         exercise_days_in=exercise_days_in,
@@ -5473,6 +5769,12 @@ def activity_level():
         page_kind="tool",
     )
 # 4.1.6 跑步消耗计算器
+_META_RUNNING_KCAL = {
+    "title": "跑步消耗计算器（跑步30分钟大概消耗多少热量）- CalmyHealth",
+    "description": "输入体重、跑步时间和速度，估算跑步大概消耗多少热量，并帮助理解跑步和日常活动量之间的关系。",
+    "canonical": _CANON["/running-kcal"],
+}
+
 @app.route("/running-kcal", methods=["GET", "POST"])
 def running_kcal():
     error = None
@@ -5482,26 +5784,20 @@ def running_kcal():
     result = None
 
     if request.method == "POST":
-        weight_kg_in = request.form.get("weight_kg", "").strip()
-        minutes_in = request.form.get("minutes", "30").strip()
-        pace_in = request.form.get("pace", "normal").strip()
+        weight_kg_in = _clean(request.form, "weight_kg")
+        minutes_in = _clean(request.form, "minutes", "30")
+        pace_in = _clean(request.form, "pace", "normal")
 
         try:
-            weight_val = float(weight_kg_in)
-            minutes_val = float(minutes_in)
+            weight_val = parse_float(weight_kg_in)
+            minutes_val = parse_float(minutes_in)
             result = running_kcal_estimate(weight_val, minutes_val, pace_in)
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "跑步消耗计算器（跑步30分钟大概消耗多少热量）- CalmyHealth",
-        "description": "输入体重、跑步时间和速度，估算跑步大概消耗多少热量，并帮助理解跑步和日常活动量之间的关系。",
-        "canonical": canonical_url("/running-kcal"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "running_kcal.html",
-        meta=meta,
+        meta=_META_RUNNING_KCAL,
         error=error,
         weight_kg_in=weight_kg_in,
         minutes_in=minutes_in,
@@ -5510,6 +5806,12 @@ def running_kcal():
         page_kind="tool",
     )
 # 4.1.7 跑步配速
+_META_RUNNING_PACE = {
+    "title": "跑步配速计算器（每公里配速 / 预计完赛时间）- CalmyHealth",
+    "description": "输入跑步距离和完成时间，计算每公里配速、平均速度，并估算 3K、5K、10K、半马和全马的预计完赛时间。",
+    "canonical": _CANON["/running-pace"],
+}
+
 @app.route("/running-pace", methods=["GET", "POST"])
 def running_pace():
     error = None
@@ -5521,31 +5823,25 @@ def running_pace():
     seconds_in = "00"
 
     if request.method == "POST":
-        distance_km_in = request.form.get("distance_km", "5").strip()
-        hours_in = request.form.get("hours", "0").strip()
-        minutes_in = request.form.get("minutes", "30").strip()
-        seconds_in = request.form.get("seconds", "00").strip()
+        distance_km_in = _clean(request.form, "distance_km", "5")
+        hours_in = _clean(request.form, "hours", "0")
+        minutes_in = _clean(request.form, "minutes", "30")
+        seconds_in = _clean(request.form, "seconds", "00")
 
         try:
-            distance_km = float(distance_km_in)
-            hours = int(hours_in)
-            minutes = int(minutes_in)
-            seconds = int(seconds_in)
+            distance_km = parse_float(distance_km_in)
+            hours = parse_int(hours_in)
+            minutes = parse_int(minutes_in)
+            seconds = parse_int(seconds_in)
 
             result = running_pace_info(distance_km, hours, minutes, seconds)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "跑步配速计算器（每公里配速 / 预计完赛时间）- CalmyHealth",
-        "description": "输入跑步距离和完成时间，计算每公里配速、平均速度，并估算 3K、5K、10K、半马和全马的预计完赛时间。",
-        "canonical": canonical_url("/running-pace"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "running_pace.html",
-        meta=meta,
+        meta=_META_RUNNING_PACE,
         error=error,
         result=result,
         distance_km_in=distance_km_in,
@@ -5555,6 +5851,12 @@ def running_pace():
         page_kind="tool",
     )
 # 4.1.8 心率区间
+_META_HEART_RATE_ZONE = {
+    "title": "心率区间计算器（Heart Rate Zone）- CalmyHealth",
+    "description": "输入年龄和可选的静息心率，估算运动心率训练区间，帮助理解恢复、燃脂、有氧、阈值和高强度心率范围。",
+    "canonical": _CANON["/heart-rate-zone"],
+}
+
 @app.route("/heart-rate-zone", methods=["GET", "POST"])
 def heart_rate_zone():
     error = None
@@ -5564,27 +5866,21 @@ def heart_rate_zone():
     resting_hr_in = ""
 
     if request.method == "POST":
-        age_in = request.form.get("age", "").strip()
-        resting_hr_in = request.form.get("resting_hr", "").strip()
+        age_in = _clean(request.form, "age")
+        resting_hr_in = _clean(request.form, "resting_hr")
 
         try:
-            age = int(age_in)
-            resting_hr = int(resting_hr_in) if resting_hr_in else None
+            age = parse_int(age_in)
+            resting_hr = parse_int(resting_hr_in) if resting_hr_in else None
 
             result = heart_rate_zone_info(age, resting_hr)
 
         except Exception as e:
-            error = str(e) if str(e) else "请输入有效数据。"
-
-    meta = {
-        "title": "心率区间计算器（Heart Rate Zone）- CalmyHealth",
-        "description": "输入年龄和可选的静息心率，估算运动心率训练区间，帮助理解恢复、燃脂、有氧、阈值和高强度心率范围。",
-        "canonical": canonical_url("/heart-rate-zone"),
-    }
+            error = str(e) or "请输入有效数据。"
 
     return render_template(
         "heart_rate_zone.html",
-        meta=meta,
+        meta=_META_HEART_RATE_ZONE,
         error=error,
         result=result,
         age_in=age_in,
@@ -5597,6 +5893,268 @@ def healthz():
     return "OK", 200
 
 
+# -----------------------
+# JSON API
+# -----------------------
+# 与页面同一套计算，只返回 JSON，字段名和对应表单一致。
+# 请求体可以是 JSON 对象，也可以是普通表单。
+BMI_BATCH_MAX_ROWS = 10000
+
+
+def _is_number(x) -> bool:
+    return type(x) in (int, float)
+
+
+def _api_data():
+    if request.is_json:
+        data = request.get_json(silent=True)
+        return data if isinstance(data, dict) else None
+    return request.form
+
+
+def _api_field(data, k: str, default: str = "") -> str:
+    # 只用于字符串字段；数值字段走 _api_number / _api_float / _api_int
+    v = data.get(k, default)
+    if not isinstance(v, str):
+        return ""
+    return _clean(data, k, default)
+
+
+def _api_number(v, lo: float, hi: float) -> float | None:
+    # JSON 数字按数值校验（同样不小于 _NUM_MIN）；字符串走表单解析
+    if _is_number(v):
+        return float(v) if lo < v <= hi and v >= _NUM_MIN else None
+    if isinstance(v, str):
+        return _parse_positive_float(v, lo, hi)
+    return None
+
+
+def _api_float(v) -> float | None:
+    if _is_number(v):
+        return float(v) if isfinite(v) else None
+    return to_float(v) if isinstance(v, str) else None
+
+
+def _api_int(v) -> int | None:
+    if type(v) is int:
+        return v
+    if type(v) is float:
+        return int(v) if v.is_integer() else None
+    return to_int(v) if isinstance(v, str) else None
+
+
+def _api_error(message: str):
+    return jsonify({"error": message}), 400
+
+
+def _api_bmi_batch(data):
+    heights = data.get("heights")
+    weights = data.get("weights")
+    if not isinstance(heights, list) or not isinstance(weights, list):
+        return _api_error("heights 和 weights 需要是数组。")
+    if len(heights) != len(weights):
+        return _api_error("heights 和 weights 长度需要一致。")
+    if len(heights) > BMI_BATCH_MAX_ROWS:
+        return _api_error(f"单次最多 {BMI_BATCH_MAX_ROWS} 条。")
+
+    bmis = []
+    categories = []
+    for i, (h, w) in enumerate(zip(heights, weights)):
+        h = _api_number(h, 0, 250)
+        if h is None:
+            return _api_error(f"第 {i + 1} 条身高不正确。")
+        w = _api_number(w, 0, 300)
+        if w is None:
+            return _api_error(f"第 {i + 1} 条体重不正确。")
+
+        try:
+            bmi_raw, cat_idx, _, _, _ = _bmi_kernel(h, w)
+            bmis.append(round1(bmi_raw))
+        except (ArithmeticError, ValueError):
+            return _api_error(f"第 {i + 1} 条数据无法计算。")
+        categories.append(_BMI_CATEGORIES[cat_idx])
+
+    return jsonify({"bmi": bmis, "category": categories})
+
+
+@app.post("/api/bmi")
+def api_bmi():
+    """
+    Single: {"height_cm": 170, "weight_kg": 65}
+    Batch:  {"heights": [170, 165, ...], "weights": [65, 58, ...]}  (cm / kg)
+    """
+    data = _api_data()
+    if data is None:
+        return _api_error("请提交 JSON 对象。")
+    if "heights" in data or "weights" in data:
+        return _api_bmi_batch(data)
+
+    h = _api_number(data.get("height_cm"), 0, 250)
+    w = _api_number(data.get("weight_kg"), 0, 300)
+    if h is None or w is None:
+        return _api_error("请输入正确的身高与体重。")
+
+    bmi_raw, cat_idx, ideal_min, ideal_max, progress = bmi_calc(h, w)
+    return jsonify({
+        "bmi": round1(bmi_raw),
+        "category": _BMI_CATEGORIES[cat_idx],
+        "progress": progress,
+        "ideal_min": round1(ideal_min),
+        "ideal_max": round1(ideal_max),
+    })
+
+
+@app.post("/api/water")
+def api_water():
+    data = _api_data()
+    if data is None:
+        return _api_error("请提交 JSON 对象。")
+
+    w = _api_number(data.get("weight_kg"), 0, 300)
+    if w is None:
+        return _api_error("请输入正确体重（kg）。")
+
+    water_ml, water_l = water_need(w)
+    return jsonify({"water_ml": water_ml, "water_l": water_l})
+
+
+@app.post("/api/sleep")
+def api_sleep():
+    data = _api_data()
+    if data is None:
+        return _api_error("请提交 JSON 对象。")
+
+    mode = _api_field(data, "mode", "sleep_now")
+    if mode not in SLEEP_MODES:
+        return _api_error("mode 只能是 sleep_now 或 wake_at。")
+    hm = parse_hm(_api_field(data, "time_hm"))
+    if hm is None:
+        return _api_error("请输入正确时间（例如 23:30）。")
+
+    return jsonify({"mode": mode, "times": sleep_cycle_times(mode, *hm)})
+
+
+def _api_mifflin(data, factor: float) -> tuple[int, int]:
+    sex = _api_field(data, "sex", "male")
+    age = _api_int(data.get("age"))
+    h = _api_number(data.get("height_cm"), 0, 250)
+    w = _api_number(data.get("weight_kg"), 0, 300)
+
+    if sex not in ("male", "female"):
+        raise ValueError("性别选择不正确。")
+    if not _in_range(age, 0, 120):
+        raise ValueError("请输入正确年龄。")
+    if h is None:
+        raise ValueError("请输入正确身高（cm）。")
+    if w is None:
+        raise ValueError("请输入正确体重（kg）。")
+    return mifflin_calc(sex == "male", age, h, w, factor)
+
+
+@app.post("/api/bmr")
+def api_bmr():
+    data = _api_data()
+    if data is None:
+        return _api_error("请提交 JSON 对象。")
+
+    try:
+        bmr_val, _ = _api_mifflin(data, 1.0)
+    except ValueError as e:
+        return _api_error(str(e))
+    return jsonify({"bmr": bmr_val})
+
+
+@app.post("/api/calorie")
+def api_calorie():
+    data = _api_data()
+    if data is None:
+        return _api_error("请提交 JSON 对象。")
+
+    try:
+        act = _api_float(data.get("activity", 1.2))
+        if act is None or not 1.1 <= act <= 2.5:
+            raise ValueError("活动水平不正确。")
+        bmr_val, tdee_val = _api_mifflin(data, act)
+    except ValueError as e:
+        return _api_error(str(e))
+    return jsonify({"bmr": bmr_val, "tdee": tdee_val})
+
+
+# -----------------------
+# Static GET pages
+# -----------------------
+# Info pages and calculator pages without form data render byte-identical HTML,
+# so render them once at import and serve the bytes before routing.
+# Pages whose GET output depends on date.today() are cached per day instead.
+DAILY_PAGES = {"/pregnancy-due-date"}
+
+def render_static_pages() -> dict:
+    # 首页、工具导航和分类页只依赖 TOOLS / CATEGORY_META，同样可以预渲染
+    paths = (
+        ["/", "/tools", "/about", "/privacy", "/contact"]
+        + [f"/category/{slug}" for slug in CATEGORY_META.keys()]
+    )
+    paths += sorted(
+        rule.rule
+        for rule in app.url_map.iter_rules()
+        if {"GET", "POST"} <= rule.methods
+        and not rule.arguments
+        and rule.rule not in DAILY_PAGES
+    )
+
+    pages = {}
+    for path in paths:
+        with app.test_request_context(path):
+            view = app.view_functions[request.endpoint]
+            pages[path] = app.make_response(view(**request.view_args)).get_data()
+    return pages
+
+
+def compress_page(body: bytes) -> tuple[bytes, bytes]:
+    # (原始 HTML, gzip 后的 HTML)；mtime=0 让同一页面每次压缩结果一致
+    return body, gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def render_daily_page(path: str) -> tuple[bytes, bytes]:
+    today = date.today()
+    cached = _DAILY_PAGE_CACHE.get(path)
+    if cached is None or cached[0] != today:
+        view = app.view_functions[request.endpoint]
+        cached = (today, compress_page(app.make_response(view()).get_data()))
+        _DAILY_PAGE_CACHE[path] = cached
+    return cached[1]
+
+
+# 路由全部注册完了，提前把 URL map 编译好
+app.url_map.update()
+
+_STATIC_PAGES = {
+    path: compress_page(body) for path, body in render_static_pages().items()
+}
+_DAILY_PAGE_CACHE = {}  # path -> (date, (bytes, gzip bytes))
+
+@app.before_request
+def serve_static_page():
+    # debug 模式下模板可能被修改，直接走正常渲染
+    if app.debug or request.method not in ("GET", "HEAD"):
+        return None
+
+    page = _STATIC_PAGES.get(request.path)
+    if page is None and request.path in DAILY_PAGES:
+        page = render_daily_page(request.path)
+    if page is None:
+        return None
+
+    body, gzip_body = page
+    if request.accept_encodings.quality("gzip") > 0:
+        resp = Response(gzip_body, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(body, mimetype="text/html")
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
 if __name__ == "__main__":
     print("Starting Flask...")
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
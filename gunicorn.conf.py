@@ -0,0 +1,12 @@
+import multiprocessing
+import os
+
+# 端口由平台通过 PORT 注入，本地默认 5000
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# 在 master 里先 import app：模板、静态页缓存和 numba 内核只准备一次，fork 后各 worker 共享
+preload_app = True
+
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = 4
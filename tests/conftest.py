@@ -0,0 +1,23 @@
+import pytest
+
+from app import app as flask_app
+
+
+@pytest.fixture
+def client():
+    return flask_app.test_client()
+
+
+@pytest.fixture
+def live_get():
+    """GET that skips serve_static_page for this one request and renders the view."""
+    def get(path, **kwargs):
+        funcs = flask_app.before_request_funcs[None]
+        saved = list(funcs)
+        funcs[:] = [f for f in saved if f.__name__ != "serve_static_page"]
+        try:
+            return flask_app.test_client().get(path, **kwargs)
+        finally:
+            funcs[:] = saved
+
+    return get
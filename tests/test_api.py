@@ -0,0 +1,115 @@
+import pytest
+
+import app
+
+
+def test_bmi_batch(client):
+    r = client.post("/api/bmi", json={"heights": [170, 160.5], "weights": [65, 50]})
+    assert r.status_code == 200
+    assert r.get_json() == {"bmi": [22.5, 19.4], "category": ["正常", "正常"]}
+
+
+def test_bmi_batch_rejects_tiny_values(client):
+    # 1e-160 / 1e-155 曾经让 hm * hm 下溢成 0 或让 BMI 溢出成 inf，返回 500
+    for h in (1e-160, 1e-155, 0.0005, 0):
+        r = client.post("/api/bmi", json={"heights": [h], "weights": [60]})
+        assert r.status_code == 400
+        assert r.get_json() == {"error": "第 1 条身高不正确。"}
+
+
+def test_bmi_batch_rejects_non_numbers(client):
+    for w in (None, True, [60], "abc"):
+        r = client.post("/api/bmi", json={"heights": [170], "weights": [w]})
+        assert r.status_code == 400
+
+
+def test_sleep_rejects_unknown_mode(client):
+    r = client.post("/api/sleep", json={"mode": "xyz", "time_hm": "07:00"})
+    assert r.status_code == 400
+
+    r = client.post("/api/sleep", json={"mode": "wake_at", "time_hm": "07:00"})
+    assert r.status_code == 200
+    assert r.get_json()["mode"] == "wake_at"
+
+
+def test_json_numbers_are_validated_as_numbers(client):
+    for height in (65.1234, 1e2, 170, "170.5"):
+        r = client.post("/api/bmi", json={"height_cm": height, "weight_kg": 60})
+        assert r.status_code == 200, height
+
+    r = client.post("/api/bmr", json={"sex": "female", "age": 30.0, "height_cm": 1.6e2, "weight_kg": 55.55555})
+    assert r.status_code == 200
+
+    r = client.post("/api/calorie", json={"sex": "male", "age": 30, "height_cm": 170, "weight_kg": 65, "activity": 1.55})
+    assert r.status_code == 200
+
+    for bad in ({"age": 30.5}, {"age": True}, {"height_cm": True}, {"weight_kg": 1e308}):
+        data = {"sex": "male", "age": 30, "height_cm": 170, "weight_kg": 65, **bad}
+        assert client.post("/api/bmr", json=data).status_code == 400, bad
+
+
+API_CASES = {
+    "/api/bmi": (
+        {"height_cm": 170, "weight_kg": 65},
+        {"bmi": 22.5, "category": "正常", "progress": 37, "ideal_min": 53.5, "ideal_max": 69.1},
+        {"height_cm": "abc", "weight_kg": 65},
+    ),
+    "/api/water": (
+        {"weight_kg": 60},
+        {"water_ml": 1980, "water_l": 2.0},
+        {"weight_kg": 0},
+    ),
+    "/api/sleep": (
+        {"mode": "sleep_now", "time_hm": "23:00"},
+        {"mode": "sleep_now", "times": ["03:45", "05:15", "06:45", "08:15"]},
+        {"mode": "sleep_now", "time_hm": "25:00"},
+    ),
+    "/api/bmr": (
+        {"sex": "male", "age": 30, "height_cm": 170, "weight_kg": 65},
+        {"bmr": 1568},
+        {"sex": "other", "age": 30, "height_cm": 170, "weight_kg": 65},
+    ),
+    "/api/calorie": (
+        {"sex": "male", "age": 30, "height_cm": 170, "weight_kg": 65, "activity": 1.2},
+        {"bmr": 1568, "tdee": 1881},
+        {"sex": "male", "age": 30, "height_cm": 170, "weight_kg": 65, "activity": 9},
+    ),
+}
+
+
+@pytest.mark.parametrize("path", sorted(API_CASES))
+def test_api_success(client, path):
+    payload, expected, _ = API_CASES[path]
+    r = client.post(path, json=payload)
+    assert r.status_code == 200
+    assert r.mimetype == "application/json"
+    assert r.get_json() == expected
+
+
+@pytest.mark.parametrize("path", sorted(API_CASES))
+def test_api_bad_input(client, path):
+    _, _, payload = API_CASES[path]
+    r = client.post(path, json=payload)
+    assert r.status_code == 400
+    assert isinstance(r.get_json()["error"], str)
+
+
+@pytest.mark.parametrize("path", sorted(API_CASES))
+def test_api_rejects_non_object_body(client, path):
+    r = client.post(path, json=[1, 2, 3])
+    assert r.status_code == 400
+
+
+def test_api_accepts_form_posts(client):
+    r = client.post("/api/water", data={"weight_kg": "60"})
+    assert r.get_json() == {"water_ml": 1980, "water_l": 2.0}
+
+
+def test_orjson_provider_output(client):
+    if app.orjson is None:
+        pytest.skip("orjson not installed")
+    assert isinstance(app.app.json, app.ORJSONProvider)
+    r = client.post("/api/sleep", json={"mode": "wake_at", "time_hm": "7:5"})
+    assert r.mimetype == "application/json"
+    assert r.get_data().endswith(b"\n")
+    assert r.get_data() == app.orjson.dumps(r.get_json(), option=app.orjson.OPT_APPEND_NEWLINE)
@@ -0,0 +1,81 @@
+from math import inf, isnan
+
+from flask import template_rendered
+
+import app
+
+
+def _post_context(client, path, data):
+    seen = []
+
+    def record(sender, template, context, **extra):
+        seen.append(context)
+
+    with template_rendered.connected_to(record, app.app):
+        r = client.post(path, data=data)
+    assert r.status_code == 200
+    return seen[-1]
+
+
+def test_round_helpers_are_total():
+    assert app.round1(2.25) == 2.3
+    assert app.round1(-2.25) == -2.3
+    assert app.round0(2.5) == 3
+    assert app.round1(inf) == inf
+    assert isnan(app.round1(float("nan")))
+    assert app.round0(-inf) == -inf
+
+
+def test_non_finite_form_numbers_get_a_form_error(client):
+    for bad in ("nan", "inf", "-inf", "9" * 400):
+        ctx = _post_context(client, "/whr", {"sex": "male", "waist_cm": bad, "hip_cm": "95"})
+        assert ctx["error"] == "请输入有效数字。"
+        assert ctx["result"] is None
+
+
+def test_out_of_range_inputs_are_rejected_before_arithmetic(client):
+    ctx = _post_context(client, "/pregnancy-weight", {"height_cm": "160", "weight_kg": "1e308"})
+    assert ctx["error"] and ctx["result"] is None
+
+    ctx = _post_context(client, "/sleep-recovery", {"debt_hours": "6", "recovery_hours": "1e-308"})
+    assert ctx["error"] and ctx["result"] is None
+
+
+def test_number_fields_accept_plain_float_spellings(client):
+    for height in ("170.", "+170", " 170 ", "170.0000"):
+        ctx = _post_context(client, "/bmi", {"height_cm": height, "weight_kg": "65"})
+        assert ctx["error"] is None
+        assert ctx["bmi"] == 22.5
+
+    ctx = _post_context(client, "/water", {"weight_kg": ".5e"})
+    assert ctx["error"] == "请输入正确体重（kg）。"
+
+
+def test_extra_decimals_are_not_rounded_away(client):
+    # 超过 3 位小数不进缓存，结果与直接计算一致
+    h, w = 170.1234, 65.98765
+    bmi_raw = app._bmi_kernel(h, w)[0]
+    ctx = _post_context(client, "/bmi", {"height_cm": str(h), "weight_kg": str(w)})
+    assert ctx["bmi"] == app.round1(bmi_raw)
+    assert app.bmi_calc(h, w) == app._bmi_kernel(h, w)
+    assert app.mifflin_calc(True, 30, h, w, 1.55) == app._mifflin(True, 30.0, h, w, 1.55)
+
+    for path, extra in (
+        ("/bmr", {}),
+        ("/calorie", {"activity": "1.2"}),
+    ):
+        data = {"sex": "male", "age": "30", "height_cm": "170.1234", "weight_kg": "+65.", **extra}
+        ctx = _post_context(client, path, data)
+        assert ctx["error"] is None
+
+
+def test_tiny_heights_are_rejected(client):
+    ctx = _post_context(client, "/bmi", {"height_cm": "0." + "0" * 200 + "1", "weight_kg": "60"})
+    assert ctx["error"] == "请输入正确的身高与体重。"
+
+
+def test_bmi_bands_follow_the_thresholds():
+    # 身高 100 cm 时 BMI 就等于体重
+    for bmi, idx in ((18.49, 0), (18.5, 1), (23.99, 1), (24.0, 2), (27.99, 2), (28.0, 3)):
+        assert app._bmi_kernel(100.0, bmi)[1] == idx
+    assert len(app._BMI_CATEGORIES) == len(app._BMI_THRESHOLDS) + 1
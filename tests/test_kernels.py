@@ -0,0 +1,39 @@
+import pytest
+
+numba = pytest.importorskip("numba")
+
+import app  # noqa: E402
+
+KERNEL_CASES = {
+    "_mifflin_kernel": [(True, 30.0, 170.0, 65.0), (False, 45.0, 158.5, 52.3)],
+    "_bodyfat_kernel": [(True, 170.0, 38.0, 85.0, 0.0), (False, 160.0, 32.0, 75.0, 95.0)],
+    "_mifflin": [(True, 30.0, 170.0, 65.0, 1.2), (False, 60.0, 150.0, 80.0, 1.9)],
+    "bmi_progress": [(22.0,), (10.0,), (40.0,), (15.1,)],
+    "_bmi_kernel": [(170.0, 65.0), (100.0, 18.5), (150.0, 90.0)],
+}
+
+
+@pytest.mark.parametrize("name", sorted(KERNEL_CASES))
+def test_kernel_is_compiled_from_its_signature(name):
+    kernel = getattr(app, name)
+    assert isinstance(kernel, numba.core.registry.CPUDispatcher)
+    # 签名写死后 import 时就编译好，只有这一个版本
+    assert len(kernel.nopython_signatures) == 1
+
+
+@pytest.mark.parametrize("name", sorted(KERNEL_CASES))
+def test_compiled_kernel_matches_python(name):
+    kernel = getattr(app, name)
+    for args in KERNEL_CASES[name]:
+        got = kernel(*args)
+        want = kernel.py_func(*args)
+        assert got == pytest.approx(want)
+
+
+def test_integer_results_stay_integers():
+    # floor() 在 numba 里返回 int64，对应签名里的 UniTuple(int64, 2) / int64
+    bmr, tdee = app._mifflin(True, 30.0, 170.0, 65.0, 1.2)
+    assert (bmr, tdee) == (1568, 1881)
+    assert type(bmr) is int and type(tdee) is int
+    assert type(app.bmi_progress(22.0)) is int
+    assert type(app._bmi_kernel(170.0, 65.0)[1]) is int
@@ -0,0 +1,78 @@
+import gzip
+from datetime import date
+
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("path", sorted(app._STATIC_PAGES))
+def test_cached_page_matches_live_render(client, live_get, path):
+    cached = client.get(path)
+    live = live_get(path)
+    assert live.status_code == 200
+    # 只有 serve_static_page 会加 Vary，用来确认第一次确实命中了缓存
+    assert "Accept-Encoding" in cached.headers.get("Vary", "")
+    assert "Vary" not in live.headers
+    assert cached.get_data() == live.get_data()
+
+
+def test_gzip_negotiation_and_vary(client):
+    body, gzip_body = app._STATIC_PAGES["/bmi"]
+
+    r = client.get("/bmi", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert r.get_data() == gzip_body
+    assert gzip.decompress(r.get_data()) == body
+
+    r = client.get("/bmi", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in r.headers
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert r.get_data() == body
+
+
+def test_head_is_served_from_cache_without_body(client):
+    body, _ = app._STATIC_PAGES["/bmi"]
+    r = client.head("/bmi")
+    assert r.status_code == 200
+    assert r.get_data() == b""
+    assert int(r.headers["Content-Length"]) == len(body)
+    assert "Accept-Encoding" in r.headers["Vary"]
+
+
+def test_post_bypasses_the_cache(client):
+    body, _ = app._STATIC_PAGES["/bmi"]
+    r = client.post("/bmi", data={"height_cm": "170", "weight_kg": "65"})
+    assert r.status_code == 200
+    assert r.get_data() != body
+    assert "22.5" in r.get_data(as_text=True)
+    assert "Content-Encoding" not in r.headers
+
+
+def test_debug_bypasses_the_cache(client, monkeypatch):
+    monkeypatch.setattr(app.app, "debug", True)
+    r = client.get("/bmi", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+
+
+def test_daily_page_rolls_over_at_midnight(client, live_get, monkeypatch):
+    today = [date(2026, 3, 1)]
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return today[0]
+
+    monkeypatch.setattr(app, "date", FakeDate)
+    monkeypatch.setattr(app, "_DAILY_PAGE_CACHE", {})
+
+    first = client.get("/pregnancy-due-date").get_data()
+    assert first == live_get("/pregnancy-due-date").get_data()
+    assert client.get("/pregnancy-due-date").get_data() == first
+
+    today[0] = date(2026, 3, 2)
+    second = client.get("/pregnancy-due-date").get_data()
+    assert second != first
+    assert second == live_get("/pregnancy-due-date").get_data()
+    assert app._DAILY_PAGE_CACHE["/pregnancy-due-date"][0] == date(2026, 3, 2)
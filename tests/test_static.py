@@ -0,0 +1,17 @@
+import app
+
+
+def test_static_urls_carry_a_content_hash(client):
+    html = client.get("/").get_data(as_text=True)
+    assert f'/static/style.css?v={app.STATIC_VERSIONS["style.css"]}"' in html
+
+
+def test_static_versions_cover_subdirectories(tmp_path, monkeypatch):
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "logo.png").write_bytes(b"png")
+    (tmp_path / "style.css").write_bytes(b"body{}")
+    monkeypatch.setattr(app.app, "static_folder", str(tmp_path))
+
+    versions = app._static_versions()
+    assert set(versions) == {"img/logo.png", "style.css"}
+    assert versions["style.css"] != versions["img/logo.png"]